@@ -4,21 +4,110 @@ Provides an interactive workflow for translating XLF files using OpenAI GPT-5.1
 """
 
 import os
+import re
+import sys
+import queue
+import logging
+import logging.handlers
+import threading
+from collections import defaultdict
+from dataclasses import replace
 from pathlib import Path
 from typing import Optional, List
 from dotenv import load_dotenv
 
 from src.parser import XLFParser
-from src.translator import XLFTranslator
+from src.translator import XLFTranslator, TranslationResult
 from src.writer import XLFWriter
+from src.cache import TranslationCache
+from src.daemon import translate_via_daemon
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Files with at least this many units to translate are offered the Batch API
+BATCH_API_THRESHOLD = 200
+
+# Text with nothing to translate: only digits, punctuation, symbols and whitespace
+NON_TRANSLATABLE_RE = re.compile(r'^[\s\d\W]+$')
+
+# A lone URL or email address
+URL_OR_EMAIL_RE = re.compile(r'^\s*(?:https?://\S+|www\.\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+)\s*$')
+
+# Segment boundary marker inserted by the parser between <g> segments
+SEG = '__SEG__'
+
+# Translator prepared in the background while the user answers prompts
+_warmup_thread: Optional[threading.Thread] = None
+_warm_translator: Optional[XLFTranslator] = None
+
+# Background printer for translator/writer log messages (see setup_logging)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _enable_ansi() -> bool:
+    """Make sure the console understands ANSI escapes (legacy Windows needs VT mode)"""
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
+def setup_logging():
+    """
+    Print progress and warnings from src.* through a background queue
+
+    Retry, batch and cleanup messages are logged by the translator and
+    writer; a QueueHandler hands them to a listener thread so emitting
+    them never blocks the translation loop. XLF_LOG_LEVEL (default INFO)
+    controls how much is shown, e.g. WARNING hides per-batch progress.
+    """
+    global _log_listener
+
+    if _log_listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+
+    src_logger = logging.getLogger('src')
+    src_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    src_logger.setLevel(os.getenv('XLF_LOG_LEVEL', 'INFO').upper())
+    src_logger.propagate = False
+
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+
+
+def flush_logs():
+    """Wait until queued log messages are printed, keeping output in order"""
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener.start()
+
 
 def clear_screen():
-    """Clear the terminal screen"""
-    os.system('clear' if os.name != 'nt' else 'cls')
+    """Clear the terminal screen (no-op when output is piped or redirected)"""
+    if not sys.stdout.isatty():
+        return
+
+    if _enable_ansi():
+        # Cursor home + clear screen, no subprocess needed
+        sys.stdout.write("\x1b[H\x1b[2J")
+        sys.stdout.flush()
+    else:
+        # Legacy Windows console without ANSI support
+        os.system('cls')
 
 
 def print_header(text: str):
@@ -108,50 +197,54 @@ def parse_and_confirm(file_path: Path) -> Optional[XLFParser]:
         # Parse the file
         parser = XLFParser(str(file_path))
 
-        # Get statistics
-        stats = parser.get_statistics()
-        units = parser.parse_all_units()
-
-        # Display statistics
-        print("📊 File Statistics:")
-        print(f"   • Total translation units: {stats['total_units']}")
-        print(f"   • Plaintext units: {stats['plaintext_units']}")
-        print(f"   • Styled units (with formatting): {stats['styled_units']}")
-        print(f"   • Total characters: {stats['total_characters']:,}")
-        print(f"   • Average characters per unit: {stats['avg_characters_per_unit']}")
-        print(f"   • Source language: {stats['source_language']}")
-        print(f"   • Target language: {stats['target_language']}")
-        print()
-
-        # Show sample units
-        print("📝 Sample Translation Units (first 3):")
-        print("-" * 70)
-        for unit in units[:3]:
-            print(f"\n   ID: {unit.id}")
-            print(f"   Type: {unit.datatype}")
+        # Stream the file once for statistics, samples and the tag pairing
+        # check; the full unit parse is deferred until translation is confirmed
+        stats = {
+            'total_units': 0,
+            'plaintext_units': 0,
+            'styled_units': 0,
+            'total_characters': 0
+        }
+        samples = []
+
+        for unit in parser.iter_units_preview():
+            stats['total_units'] += 1
+            if unit.datatype == 'plaintext':
+                stats['plaintext_units'] += 1
+            elif unit.datatype == 'x-DocumentState':
+                stats['styled_units'] += 1
+            stats['total_characters'] += len(unit.translatable_text)
+
+            if len(samples) < 3:
+                samples.append(unit)
+
+        avg_chars = stats['total_characters'] / stats['total_units'] if stats['total_units'] else 0
+
+        # Display statistics and sample units with a single write
+        lines = [
+            "📊 File Statistics:",
+            f"   • Total translation units: {stats['total_units']}",
+            f"   • Plaintext units: {stats['plaintext_units']}",
+            f"   • Styled units (with formatting): {stats['styled_units']}",
+            f"   • Total characters: {stats['total_characters']:,}",
+            f"   • Average characters per unit: {round(avg_chars, 2)}",
+            f"   • Source language: {parser.get_source_language()}",
+            f"   • Target language: {parser.get_target_language() or 'not specified'}",
+            "",
+            "📝 Sample Translation Units (first 3):",
+            "-" * 70
+        ]
+        for unit in samples:
             preview = unit.translatable_text[:80]
             if len(unit.translatable_text) > 80:
                 preview += "..."
-            print(f"   Text: {preview}")
-        print("\n" + "-" * 70)
-
-        # Validate tag pairing
-        print("\n> Validating tag structure...")
-        validation_errors = []
-        for unit in units:
-            if unit.has_inline_tags:
-                is_valid, error = parser.validate_tag_pairing(unit.source_element)
-                if not is_valid:
-                    validation_errors.append(f"Unit {unit.id}: {error}")
-
-        if validation_errors:
-            print("⚠️  Validation warnings:")
-            for error in validation_errors[:5]:  # Show first 5 errors
-                print(f"   • {error}")
-            if len(validation_errors) > 5:
-                print(f"   ... and {len(validation_errors) - 5} more")
-        else:
-            print(" All tags properly paired!")
+            lines += [
+                f"\n   ID: {unit.id}",
+                f"   Type: {unit.datatype}",
+                f"   Text: {preview}"
+            ]
+        lines.append("\n" + "-" * 70)
+        sys.stdout.write("\n".join(lines) + "\n")
 
         print(f"\n Successfully parsed {stats['total_units']} translation units!")
 
@@ -162,6 +255,74 @@ def parse_and_confirm(file_path: Path) -> Optional[XLFParser]:
         return None
 
 
+def report_tag_validation(parser: XLFParser):
+    """Show the result of the tag pairing check done during the preview pass"""
+    print("\n> Validating tag structure...")
+    try:
+        validation_errors = [f"Unit {unit_id}: {error}" for unit_id, error in parser.find_unpaired_tags()]
+    except Exception as e:
+        print(f"⚠️  Could not validate tags: {e}")
+        return
+
+    if validation_errors:
+        print("⚠️  Validation warnings:")
+        for error in validation_errors[:5]:  # Show first 5 errors
+            print(f"   • {error}")
+        if len(validation_errors) > 5:
+            print(f"   ... and {len(validation_errors) - 5} more")
+    else:
+        print(" All tags properly paired!")
+
+
+def is_non_translatable(text: str, preserve_re: Optional[re.Pattern]) -> bool:
+    """
+    Check whether a unit can be copied to the target unchanged
+
+    True for numbers/punctuation, a bare URL or email address, and text
+    made up only of preserve-terms (plus punctuation and whitespace).
+    """
+    if NON_TRANSLATABLE_RE.match(text) or URL_OR_EMAIL_RE.match(text):
+        return True
+
+    if preserve_re is not None:
+        rest = preserve_re.sub('', text)
+        return not rest.strip() or bool(NON_TRANSLATABLE_RE.match(rest))
+
+    return False
+
+
+def start_warmup():
+    """
+    Prepare the translator in a background thread
+
+    Creating the client and making one cheap API request resolves DNS,
+    completes the TLS handshake, checks the API key and reads the account's
+    rate limits while the user is still typing answers.
+    perform_translation() picks the result up.
+    """
+    global _warmup_thread
+
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key or _warmup_thread is not None:
+        return
+
+    _warmup_thread = threading.Thread(target=_warmup, args=(api_key,), daemon=True)
+    _warmup_thread.start()
+
+
+def _warmup(api_key: str):
+    """Background part of start_warmup()"""
+    global _warm_translator
+
+    try:
+        translator = XLFTranslator(api_key=api_key, model="gpt-5.1")
+        translator.warm_up()
+        _warm_translator = translator
+    except Exception:
+        # Any real problem is reported when translation starts
+        pass
+
+
 def confirm_translation() -> bool:
     """
     Ask user if they want to proceed with translation
@@ -183,6 +344,32 @@ def confirm_translation() -> bool:
 
 
 
+def confirm_batch_mode(unit_count: int) -> bool:
+    """
+    Ask user whether to submit the translation through the OpenAI Batch API
+
+    Args:
+        unit_count: Number of units that would be submitted
+
+    Returns:
+        True if the user chose batch mode, False for immediate translation
+    """
+    print_header("Batch Mode")
+    print(f"{unit_count} units can be submitted through the OpenAI Batch API.")
+    print("Batch mode is 50% cheaper, but results can take up to 24 hours.")
+    print()
+
+    while True:
+        choice = input("Batch mode: 50% cheaper but up to 24h - proceed? (yes/no): ").strip().lower()
+
+        if choice in ['yes', 'y']:
+            return True
+        elif choice in ['no', 'n']:
+            return False
+        else:
+            print("❌ Please enter 'yes' or 'no'.")
+
+
 def get_target_language() -> str:
     """
     Ask user for target language
@@ -219,8 +406,7 @@ def get_translation_parameters() -> tuple:
 
     preserve_terms = None
     if terms_input:
-        preserve_terms = [term.strip() for term in terms_input.split(',')]
-        preserve_terms = [term for term in preserve_terms if term]
+        preserve_terms = list(filter(None, map(str.strip, terms_input.split(','))))
         if preserve_terms:
             print(f"\nWill preserve: {', '.join(preserve_terms)}")
     else:
@@ -264,14 +450,16 @@ def get_translation_parameters() -> tuple:
     return preserve_terms, context
 
 
-def validate_translation_structure(parser: XLFParser, results: List, original_units: List) -> bool:
+def validate_translation_structure(ids: List[str],
+                                   original_texts: List[str],
+                                   translated_texts: List[Optional[str]]) -> bool:
     """
     Validate that translated content maintains source file structure
 
     Args:
-        parser: XLFParser instance
-        results: List of TranslationResult objects
-        original_units: List of original TransUnit objects
+        ids: Unit IDs
+        original_texts: Source text of each unit (aligned with ids)
+        translated_texts: Translated text of each unit, None where translation failed
 
     Returns:
         True if validation passes, False otherwise
@@ -281,64 +469,65 @@ def validate_translation_structure(parser: XLFParser, results: List, original_un
     validation_passed = True
     issues = []
 
+    # Indices of units that have a translation to check
+    checked = [i for i, text in enumerate(translated_texts) if text is not None]
+
     # Check 1: Count matches
-    successful_results = [r for r in results if r.success]
-    if len(successful_results) != len(original_units):
-        issues.append(f"Unit count mismatch: {len(successful_results)} translated vs {len(original_units)} original")
+    if len(checked) != len(ids):
+        issues.append(f"Unit count mismatch: {len(checked)} translated vs {len(ids)} original")
         validation_passed = False
 
-    # Check 2: Validate each translation
-    result_map = {r.unit_id: r for r in results if r.success}
-
-    for unit in original_units:
-        if unit.id not in result_map:
-            continue
-
-        result = result_map[unit.id]
-        original_text = unit.translatable_text
-        translated_text = result.translated_text
-
-        # Check __SEG__ markers preservation
-        if '__SEG__' in original_text:
-            original_seg_count = original_text.count('__SEG__')
-            translated_seg_count = translated_text.count('__SEG__')
-
-            if original_seg_count != translated_seg_count:
-                issues.append(f"Unit {unit.id}: __SEG__ marker mismatch ({original_seg_count} -> {translated_seg_count})")
-                validation_passed = False
-
-        # Check for empty translations
-        if not translated_text.strip() and original_text.strip():
-            issues.append(f"Unit {unit.id}: Empty translation for non-empty source")
-            validation_passed = False
+    # Per-unit measurements, computed once in bulk
+    src = [original_texts[i] for i in checked]
+    tgt = [translated_texts[i] for i in checked]
+    src_counts = [text.count(SEG) for text in src]
+    tgt_counts = [text.count(SEG) for text in tgt]
+    ratios = [len(t) / len(s) if len(s) > 10 else 1.0 for s, t in zip(src, tgt)]  # Only check non-trivial text
+
+    # Positions (into checked) of each kind of violation; messages are only
+    # formatted for these, so the work scales with problems, not with units
+    seg_bad = [k for k, (a, b) in enumerate(zip(src_counts, tgt_counts)) if a and a != b]
+    empty_bad = [k for k, (s, t) in enumerate(zip(src, tgt)) if not t.strip() and s.strip()]
+    long_bad = [k for k, ratio in enumerate(ratios) if ratio > 3.0]
+    short_bad = [k for k, ratio in enumerate(ratios) if ratio < 0.2]
+
+    # Check 2: __SEG__ markers preservation
+    for k in seg_bad:
+        issues.append(f"Unit {ids[checked[k]]}: __SEG__ marker mismatch ({src_counts[k]} -> {tgt_counts[k]})")
+
+    # Check 3: Empty translations for non-empty source
+    for k in empty_bad:
+        issues.append(f"Unit {ids[checked[k]]}: Empty translation for non-empty source")
+
+    if seg_bad or empty_bad:
+        validation_passed = False
 
-        # Check length discrepancy (warn if translation is >300% or <20% of original)
-        if len(original_text) > 10:  # Only check for non-trivial text
-            ratio = len(translated_text) / len(original_text)
-            if ratio > 3.0:
-                issues.append(f"Unit {unit.id}: Translation suspiciously long ({ratio:.1f}x original)")
-            elif ratio < 0.2:
-                issues.append(f"Unit {unit.id}: Translation suspiciously short ({ratio:.1f}x original)")
+    # Check 4: Length discrepancy (warn if translation is >300% or <20% of original)
+    for k in long_bad:
+        issues.append(f"Unit {ids[checked[k]]}: Translation suspiciously long ({ratios[k]:.1f}x original)")
+    for k in short_bad:
+        issues.append(f"Unit {ids[checked[k]]}: Translation suspiciously short ({ratios[k]:.1f}x original)")
 
     # Display results
     if validation_passed and not issues:
-        print("All structure validations passed!")
-        print(f"  - {len(successful_results)} units validated")
-        print("  - All __SEG__ markers preserved")
-        print("  - No structural issues detected")
+        lines = [
+            "All structure validations passed!",
+            f"  - {len(checked)} units validated",
+            "  - All __SEG__ markers preserved",
+            "  - No structural issues detected"
+        ]
     else:
         if not validation_passed:
-            print("CRITICAL ISSUES DETECTED:")
+            lines = ["CRITICAL ISSUES DETECTED:"]
         else:
-            print("WARNINGS (not blocking):")
+            lines = ["WARNINGS (not blocking):"]
 
-        for issue in issues[:10]:  # Show first 10 issues
-            print(f"  - {issue}")
+        lines += [f"  - {issue}" for issue in issues[:10]]  # Show first 10 issues
 
         if len(issues) > 10:
-            print(f"  ... and {len(issues) - 10} more issues")
+            lines.append(f"  ... and {len(issues) - 10} more issues")
 
-    print()
+    sys.stdout.write("\n".join(lines) + "\n\n")
     return validation_passed
 
 
@@ -371,10 +560,15 @@ def perform_translation(parser: XLFParser,
         print("  export OPENAI_API_KEY='your-key-here'")
         return False
 
-    # Initialize translator
+    # Initialize translator (reusing the warmed-up one if available)
     print("🔄 Initializing translator (GPT-5.1)...")
+    if _warmup_thread is not None:
+        _warmup_thread.join()
     try:
-        translator = XLFTranslator(api_key=api_key, model="gpt-5.1")
+        if _warm_translator is not None and _warm_translator.api_key == api_key:
+            translator = _warm_translator
+        else:
+            translator = XLFTranslator(api_key=api_key, model="gpt-5.1")
     except Exception as e:
         print(f"❌ Error initializing translator: {e}")
         return False
@@ -384,56 +578,183 @@ def perform_translation(parser: XLFParser,
     print(f"📊 Found {len(units)} units to translate")
     print()
 
-    # Prepare units for translation
-    translation_units = []
+    # Translation cache (see XLF_CACHE in src/cache.py)
+    cache = TranslationCache()
+    cache_keys = {}
+
+    # Prepare units for translation as parallel arrays, built in one pass
+    ids = []
+    texts = []
+    seg_flags = []
+    unit_refs = []  # Keep references for writing later
+    pending = []    # Indices of units that still need the API
+    preloaded_results = []
+    cached_results = []
+    # Longest terms first so "Pixel Pals" wins over "Pixel"
+    preserve_re = re.compile('|'.join(
+        re.escape(term) for term in sorted(set(preserve_terms), key=len, reverse=True)
+    )) if preserve_terms else None
     for unit in units:
+        text = unit.translatable_text
+
         # Skip empty units
-        if not unit.translatable_text.strip():
+        if not text.strip():
             continue
 
-        translation_units.append({
-            'text': unit.translatable_text,
-            'id': unit.id,
-            'has_seg_markers': '__SEG__' in unit.translatable_text,
-            'unit_obj': unit  # Keep reference for writing later
-        })
+        idx = len(ids)
+        ids.append(unit.id)
+        texts.append(text)
+        seg_flags.append(len(unit.segments) > 1)
+        unit_refs.append(unit)
+
+        # Numbers, URLs and bare preserve-terms are copied as-is
+        if is_non_translatable(text, preserve_re):
+            preloaded_results.append(TranslationResult(
+                success=True,
+                translated_text=text,
+                original_text=text,
+                unit_id=unit.id
+            ))
+            continue
 
-    print(f"> Translating {len(translation_units)} units...")
+        if cache.enabled:
+            key = cache.make_key(translator.model, target_language,
+                                 preserve_terms, context, text)
+            cache_keys[unit.id] = key
+
+            cached_text = cache.get(key)
+            if cached_text is not None:
+                cached_results.append(TranslationResult(
+                    success=True,
+                    translated_text=cached_text,
+                    original_text=text,
+                    unit_id=unit.id
+                ))
+                continue
+
+        pending.append(idx)
+
+    id_index = {unit_id: idx for idx, unit_id in enumerate(ids)}
+
+    # Translate each distinct text once; the result is fanned out afterwards
+    duplicates = defaultdict(list)  # text -> indices of every unit using it
+    for i in pending:
+        duplicates[texts[i]].append(i)
+
+    translation_units = [
+        {'text': text, 'id': ids[idxs[0]], 'has_seg_markers': seg_flags[idxs[0]]}
+        for text, idxs in duplicates.items()
+    ]
+
+    if preloaded_results:
+        print(f"⏭️  {len(preloaded_results)} units need no translation (numbers, symbols, preserved terms)")
+    if cached_results:
+        print(f"💾 {len(cached_results)} units served from cache")
+    if len(pending) > len(translation_units):
+        print(f"🔁 {len(pending) - len(translation_units)} duplicate units will reuse a translation")
+
+    # Large files (or XLF_USE_BATCH=1) may go through the Batch API instead
+    use_batch_api = bool(translation_units) and (
+        len(translation_units) >= BATCH_API_THRESHOLD or os.getenv('XLF_USE_BATCH') == '1'
+    )
+    if use_batch_api:
+        use_batch_api = confirm_batch_mode(len(translation_units))
+
+    # Number of API requests allowed in flight at once
+    concurrency = max(1, int(os.getenv('XLF_CONCURRENCY', '16')))
+
+    # A running translation daemon (see src/daemon.py) batches across files
+    daemon_socket = None if use_batch_api else os.getenv('XLF_DAEMON_SOCKET')
+
+    if use_batch_api:
+        print(f"> Translating {len(translation_units)} units via the Batch API...")
+    elif daemon_socket:
+        print(f"> Translating {len(translation_units)} units via the daemon at {daemon_socket}...")
+    else:
+        print(f"> Translating {len(translation_units)} units (concurrency: {concurrency})...")
     print("-" * 70)
 
     # Translate with custom context if provided
-    results = translator.translate_batch(
-        units=translation_units,
-        target_language=target_language,
-        preserve_terms=preserve_terms,
-        custom_context=context if context else None
-    )
+    api_results = []
+    if translation_units and daemon_socket:
+        try:
+            api_results = translate_via_daemon(
+                units=translation_units,
+                target_language=target_language,
+                preserve_terms=preserve_terms,
+                custom_context=context if context else None,
+                socket_path=daemon_socket
+            )
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"⚠️  Daemon unavailable ({e}), translating directly")
+            daemon_socket = None
+        else:
+            # The daemon's translator did the work; count it here for the summary
+            for r in api_results:
+                translator.stats.record(r.success)
+
+    if translation_units and not daemon_socket:
+        api_results = translator.translate_batch(
+            units=translation_units,
+            target_language=target_language,
+            preserve_terms=preserve_terms,
+            custom_context=context if context else None,
+            max_concurrency=concurrency,
+            use_batch_api=use_batch_api
+        )
+
+    # Remember successful translations for future runs
+    cache.put_many([
+        (cache_keys[r.unit_id], r.translated_text)
+        for r in api_results if r.success and r.unit_id in cache_keys
+    ])
+
+    # Fan each result out to every unit sharing its source text
+    api_results = [
+        replace(r, unit_id=ids[i])
+        for r in api_results
+        for i in duplicates[texts[id_index[r.unit_id]]]
+    ]
+
+    results = preloaded_results + cached_results + api_results
+
+    # Successful translation per unit, aligned with ids (None = failed)
+    translated_texts = [None] * len(ids)
+    for r in results:
+        if r.success:
+            translated_texts[id_index[r.unit_id]] = r.translated_text
 
     # Show results
+    flush_logs()
     print()
     print_header("Translation Results")
 
     stats = translator.get_statistics()
-    print(f" Successful: {stats['successful']}")
-    print(f"❌ Failed: {stats['failed']}")
-    print(f"🔄 Retries: {stats['retries']}")
-    print(f"📊 Success rate: {stats['success_rate']}%")
+    lines = [
+        f" Successful: {stats['successful']}",
+        f"❌ Failed: {stats['failed']}",
+        f"🔄 Retries: {stats['retries']}",
+        f"📊 Success rate: {stats['success_rate']}%",
+        f"🧊 Cache hit rate: {stats['cache_hit_rate']}% "
+        f"({stats['cached_tokens']:,}/{stats['prompt_tokens']:,} prompt tokens)",
+        f"💾 Served from cache: {cache.hits}"
+    ]
 
     # Show failed translations
     failed_results = [r for r in results if not r.success]
     if failed_results:
-        print(f"\n⚠️  Failed translations:")
-        for result in failed_results[:5]:
-            print(f"   • {result.unit_id}: {result.error_message}")
+        lines.append(f"\n⚠️  Failed translations:")
+        lines += [f"   • {result.unit_id}: {result.error_message}" for result in failed_results[:5]]
         if len(failed_results) > 5:
-            print(f"   ... and {len(failed_results) - 5} more")
+            lines.append(f"   ... and {len(failed_results) - 5} more")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Validate translation structure
     print()
     validation_passed = validate_translation_structure(
-        parser=parser,
-        results=results,
-        original_units=[unit_dict['unit_obj'] for unit_dict in translation_units]
+        ids=ids,
+        original_texts=texts,
+        translated_texts=translated_texts
     )
 
     if not validation_passed:
@@ -458,32 +779,27 @@ def perform_translation(parser: XLFParser,
     try:
         writer = XLFWriter(parser)
 
-        # Map results back to units
-        result_map = {r.unit_id: r for r in results}
-
-        for unit_dict in translation_units:
-            unit = unit_dict['unit_obj']
-            result = result_map.get(unit.id)
-
-            if result and result.success:
-                writer.update_translation(unit, result.translated_text)
+        for unit, translated_text in zip(unit_refs, translated_texts):
+            if translated_text is not None:
+                writer.update_translation(unit, translated_text)
 
         writer.save(str(output_path))
+        flush_logs()
 
         print(f"\n Translation saved to: {output_path}")
         print(f"📊 File size: {output_path.stat().st_size / 1024:.2f} KB")
 
         # CRITICAL: Validate output file for __SEG__ markers
         print_header("Final Validation")
-        validation = writer.validate_output(str(output_path))
+        validation = writer.validate_tree()
 
         if validation['total_seg_markers'] > 0:
             print(f"\nCRITICAL ERROR: Found {validation['total_seg_markers']} __SEG__ markers in output!")
             print("These will appear as literal text in Storyline!")
             print("\nProblem units:")
             for issue in validation['issues']['seg_markers'][:5]:
-                print(f"  - {issue['unit_id']}: {issue['count']} markers")
-                print(f"    Preview: {issue['preview']}...")
+                print(f"  - {issue['unit_id']}: {issue['marker_count']} markers (g {issue['g_id']})")
+                print(f"    Preview: {issue['text'][:50]}...")
             print("\nDO NOT IMPORT THIS FILE TO STORYLINE!")
             print("Please report this as a bug.")
             return False
@@ -512,6 +828,8 @@ def perform_translation(parser: XLFParser,
 def main():
     """Main interactive workflow"""
 
+    setup_logging()
+
     try:
         clear_screen()
         print_header("XLF Translation Tool")
@@ -537,10 +855,14 @@ def main():
             print("\nL Failed to parse file. Exiting.")
             return
 
+        # Warm up the API connection while the user answers the next prompts
+        start_warmup()
+
         # Step 4: Confirm translation
         if not confirm_translation():
             print("\n=K Translation cancelled. Goodbye!")
             return
+        report_tag_validation(parser)
 
         # Step 5: Get translation parameters (terms to preserve + context)
         preserve_terms, context = get_translation_parameters()
@@ -5,5 +5,6 @@ XLF Translation Tool - Source Modules
 from .parser import XLFParser
 from .translator import XLFTranslator
 from .writer import XLFWriter
+from .cache import TranslationCache
 
-__all__ = ['XLFParser', 'XLFTranslator', 'XLFWriter']
+__all__ = ['XLFParser', 'XLFTranslator', 'XLFWriter', 'TranslationCache']
@@ -0,0 +1,139 @@
+"""
+Translation Cache Module
+
+Stores successful translations in a local SQLite database so that
+re-running a file (e.g. after a validation failure) or translating files
+that share boilerplate units does not pay for the same text twice.
+
+Controlled with the XLF_CACHE environment variable:
+- on (default): read from and write to the cache
+- off: bypass the cache entirely
+- refresh: ignore cached entries but store the new translations
+- delete: delete the cache file first, then behave like 'on'
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+CACHE_PATH = Path.home() / '.cache' / 'xlf-translator' / 'cache.sqlite'
+CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+
+CACHE_MODES = ('on', 'off', 'refresh', 'delete')
+
+# One connection per database file, shared by the whole process
+_connections: Dict[Path, sqlite3.Connection] = {}
+
+
+def get_cache_mode() -> str:
+    """Read the cache mode from XLF_CACHE (defaults to 'on')"""
+    mode = os.getenv('XLF_CACHE', 'on').strip().lower()
+    if mode not in CACHE_MODES:
+        print(f"Warning: Unknown XLF_CACHE value '{mode}', using 'on'")
+        return 'on'
+    return mode
+
+
+def _get_connection(path: Path = CACHE_PATH) -> sqlite3.Connection:
+    """Open the cache database at path on first use and reuse it afterwards"""
+    path = Path(path)
+    connection = _connections.get(path)
+
+    if connection is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(path))
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations "
+            "(key TEXT PRIMARY KEY, translated TEXT, ts INTEGER)"
+        )
+        # Drop expired rows so the file doesn't grow forever
+        connection.execute(
+            "DELETE FROM translations WHERE ts < ?",
+            (int(time.time()) - CACHE_TTL_SECONDS,)
+        )
+        connection.commit()
+        _connections[path] = connection
+
+    return connection
+
+
+class TranslationCache:
+    """Persistent per-unit translation cache backed by SQLite"""
+
+    def __init__(self, mode: Optional[str] = None, path: Path = CACHE_PATH):
+        """
+        Initialize the cache
+
+        Args:
+            mode: One of 'on', 'off', 'refresh', 'delete' (default: XLF_CACHE)
+            path: Location of the SQLite database
+        """
+        self.mode = mode or get_cache_mode()
+        self.path = path
+        self.hits = 0
+
+        if self.mode == 'delete':
+            self._delete()
+            self.mode = 'on'
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @staticmethod
+    def make_key(model: str,
+                 target_language: str,
+                 preserve_terms: Optional[List[str]],
+                 context: Optional[str],
+                 text: str) -> str:
+        """
+        Build the cache key for a unit
+
+        Everything that influences the translation goes into the key, so a
+        change of model, language, terms or context never returns stale text.
+        """
+        terms = ','.join(sorted(preserve_terms or []))
+        raw = '\0'.join([model, target_language, terms, context or '', text])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached translation for key, or None on a miss"""
+        if self.mode != 'on':
+            return None
+
+        row = _get_connection(self.path).execute(
+            "SELECT translated, ts FROM translations WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or row[1] < time.time() - CACHE_TTL_SECONDS:
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def put_many(self, entries: List[Tuple[str, str]]):
+        """Store successful translations as (key, translated) pairs"""
+        if not self.enabled or not entries:
+            return
+
+        now = int(time.time())
+        conn = _get_connection(self.path)
+        conn.executemany(
+            "INSERT OR REPLACE INTO translations (key, translated, ts) VALUES (?, ?, ?)",
+            [(key, translated, now) for key, translated in entries]
+        )
+        conn.commit()
+
+    def _delete(self):
+        """Remove the cache database (and its WAL side files)"""
+        connection = _connections.pop(Path(self.path), None)
+        if connection is not None:
+            connection.close()
+
+        for suffix in ('', '-wal', '-shm'):
+            Path(str(self.path) + suffix).unlink(missing_ok=True)
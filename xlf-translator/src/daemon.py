@@ -0,0 +1,208 @@
+"""
+Translation Daemon
+
+Long-running local server that merges translation requests from several
+CLI runs (e.g. sibling XLF files translated one after another) into
+shared API batches. Requests arriving within a short window are combined,
+so they share one connection pool and one stable system prompt prefix.
+
+Start the server:
+    python -m src.daemon
+
+Then point the CLI at it:
+    XLF_DAEMON_SOCKET=/tmp/xlf-trans.sock python main.py
+
+Protocol: one JSON request per connection on a Unix socket, answered with
+one JSON list of TranslationResult fields in the same order as the units.
+"""
+
+import os
+import json
+import socket
+import asyncio
+import logging
+from dataclasses import asdict
+from typing import List, Dict, Optional
+
+from .translator import XLFTranslator, TranslationResult
+
+
+SOCKET_PATH = '/tmp/xlf-trans.sock'
+
+# A buffered window is flushed when any of these limits is reached
+BATCH_WINDOW_SECONDS = 0.25
+MAX_REQUESTS_PER_WINDOW = 8
+MAX_TOKENS_PER_WINDOW = 32000
+
+
+def translate_via_daemon(units: List[Dict],
+                         target_language: str,
+                         preserve_terms: Optional[List[str]] = None,
+                         custom_context: Optional[str] = None,
+                         socket_path: str = SOCKET_PATH) -> List[TranslationResult]:
+    """
+    Send units to a running daemon and wait for the translations
+
+    Args:
+        units: List of dicts with keys: 'text', 'id', 'has_seg_markers'
+        target_language: Target language
+        preserve_terms: Terms to preserve across all units
+        custom_context: Additional context/rules to include in prompts
+        socket_path: Unix socket the daemon listens on
+
+    Returns:
+        List of TranslationResult objects
+    """
+    request = {
+        'units': units,
+        'target_language': target_language,
+        'preserve_terms': preserve_terms,
+        'custom_context': custom_context
+    }
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8'))
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    response = json.loads(b''.join(chunks))
+    if isinstance(response, dict):
+        raise RuntimeError(f"Daemon error: {response.get('error')}")
+
+    return [TranslationResult(**item) for item in response]
+
+
+class BatchBuffer:
+    """Collects incoming requests and translates them together"""
+
+    def __init__(self,
+                 translator: XLFTranslator,
+                 window: float = BATCH_WINDOW_SECONDS,
+                 max_requests: int = MAX_REQUESTS_PER_WINDOW,
+                 max_tokens: int = MAX_TOKENS_PER_WINDOW):
+        self.translator = translator
+        self.window = window
+        self.max_requests = max_requests
+        self.max_tokens = max_tokens
+
+        self._pending = []  # (request, future) pairs
+        self._tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, request: Dict) -> List[TranslationResult]:
+        """Queue a request and wait for its results"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future))
+        self._tokens += sum(self.translator._estimate_tokens(u['text']) for u in request['units'])
+
+        if len(self._pending) >= self.max_requests or self._tokens >= self.max_tokens:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Hand the buffered requests to the translator"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending, self._tokens = self._pending, [], 0
+        if pending:
+            asyncio.ensure_future(self._translate(pending))
+
+    async def _translate(self, pending: List):
+        """Translate buffered requests, one combined call per prompt settings"""
+        # Only requests with identical settings can share a system prompt
+        groups: Dict[tuple, List] = {}
+        for number, (request, future) in enumerate(pending):
+            key = (
+                request['target_language'],
+                tuple(sorted(request.get('preserve_terms') or [])),
+                request.get('custom_context') or ''
+            )
+            groups.setdefault(key, []).append((number, request, future))
+
+        for (target_language, terms, context), members in groups.items():
+            # Prefix unit ids so they stay unique across files
+            units = [
+                {**unit, 'id': f"{number}:{unit['id']}"}
+                for number, request, _ in members
+                for unit in request['units']
+            ]
+
+            try:
+                results = await asyncio.to_thread(
+                    self.translator.translate_batch,
+                    units=units,
+                    target_language=target_language,
+                    preserve_terms=list(terms) or None,
+                    custom_context=context or None
+                )
+            except Exception as e:
+                for _, _, future in members:
+                    future.set_exception(e)
+                continue
+
+            # Demultiplex by the request number in the unit id
+            by_request: Dict[int, List[TranslationResult]] = {}
+            for result in results:
+                number, unit_id = result.unit_id.split(':', 1)
+                result.unit_id = unit_id
+                by_request.setdefault(int(number), []).append(result)
+
+            for number, _, future in members:
+                future.set_result(by_request.get(number, []))
+
+
+async def serve(socket_path: str = SOCKET_PATH, translator: Optional[XLFTranslator] = None):
+    """Run the daemon until interrupted (with a default GPT-5.1 translator)"""
+    if translator is None:
+        translator = XLFTranslator(model="gpt-5.1")
+    try:
+        await asyncio.to_thread(translator.warm_up)
+    except Exception as e:
+        print(f"Warning: warm-up request failed ({e})")
+    buffer = BatchBuffer(translator)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(await reader.read())
+            results = await buffer.submit(request)
+            response = [asdict(r) for r in results]
+        except Exception as e:
+            response = {'error': str(e)}
+
+        writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+        await writer.drain()
+        writer.close()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    print(f"Translation daemon listening on {socket_path}")
+
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Start the daemon (socket path from XLF_DAEMON_SOCKET if set)"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    try:
+        asyncio.run(serve(os.getenv('XLF_DAEMON_SOCKET') or SOCKET_PATH))
+    except KeyboardInterrupt:
+        print("\nDaemon stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,22 +13,152 @@ Key features:
 """
 
 from lxml import etree
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
-import re
+import logging
 
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Separator placed between <g> segments in the text sent for translation
+SEG_SEPARATOR = ' __SEG__ '
+
+# Clark-notation tag names, so lookups skip namespace prefix resolution
+_NS = 'urn:oasis:names:tc:xliff:document:1.2'
+_TAG_FILE = f'{{{_NS}}}file'
+_TAG_TU = f'{{{_NS}}}trans-unit'
+_TAG_SOURCE = f'{{{_NS}}}source'
+_TAG_G = f'{{{_NS}}}g'
+_TAG_BPT = f'{{{_NS}}}bpt'
+_TAG_EPT = f'{{{_NS}}}ept'
+_ATTR_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+
+@dataclass(slots=True)
+class GSegment:
+    """A translatable <g ctype="x-text"> segment of a styled unit"""
+    index: int
+    element: etree._Element
+    original_text: str
+
+
+@dataclass(slots=True)
 class TransUnit:
     """Represents a single translation unit from XLF"""
     id: str
     datatype: str
     source_element: etree._Element  # Keep reference to original element
-    translatable_text: str
+    segments: Tuple[str, ...]  # Cleaned text of each segment (one for plaintext)
     has_inline_tags: bool
     xml_space_preserve: bool
     tag_map: Dict[str, etree._Element]  # Placeholder -> original tag element
-    g_segments: List[Dict]  # For x-DocumentState: list of <g> tag info
+    g_segments: List[GSegment]  # For x-DocumentState: one per <g ctype="x-text">
+
+    @property
+    def translatable_text(self) -> str:
+        """Segments merged with __SEG__ markers, as sent to the translator"""
+        return SEG_SEPARATOR.join(self.segments)
+
+
+class UnitPreview(NamedTuple):
+    """Lightweight summary of a trans-unit (no XML references kept)"""
+    id: str
+    datatype: str
+    translatable_text: str
+
+
+class StatsTarget:
+    """
+    lxml parser target that tallies get_statistics() counts
+
+    Receives start/data/end events only, so no tree and no TransUnit objects
+    are built. Character counts follow the same rules as the unit parsers
+    (whitespace handling and ' __SEG__ ' joins included).
+    """
+
+    def __init__(self):
+        self.total_units = 0
+        self.plaintext_units = 0
+        self.styled_units = 0
+        self.total_characters = 0
+
+        self._depth = 0
+        self._unit_depth = None  # Depth of the open <trans-unit>
+        self._source_depth = None  # Depth of its open <source>
+        self._has_source = False
+        self._datatype = 'plaintext'
+        self._preserve = False
+        self._texts = []  # Plaintext: [source text]; styled: one entry per <g>
+        self._capture = None  # Buffer currently receiving character data
+
+    def start(self, tag, attrib):
+        # Element text ends where the first child starts
+        self._capture = None
+        self._depth += 1
+
+        if tag == _TAG_TU:
+            self._unit_depth = self._depth
+            self._has_source = False
+            self._datatype = attrib.get('datatype', 'plaintext')
+            self._preserve = attrib.get(_ATTR_XML_SPACE) == 'preserve'
+            self._texts = []
+        elif self._unit_depth is not None:
+            if (tag == _TAG_SOURCE and not self._has_source
+                    and self._depth == self._unit_depth + 1):
+                self._has_source = True
+                self._source_depth = self._depth
+                if self._datatype != 'x-DocumentState':
+                    self._capture = []
+                    self._texts.append(self._capture)
+            elif (self._source_depth is not None and tag == _TAG_G
+                    and attrib.get('ctype') == 'x-text'
+                    and self._datatype == 'x-DocumentState'):
+                self._capture = []
+                self._texts.append(self._capture)
+
+    def data(self, text):
+        if self._capture is not None:
+            self._capture.append(text)
+
+    def comment(self, text):
+        self._capture = None
+
+    def pi(self, target, data):
+        self._capture = None
+
+    def end(self, tag):
+        self._capture = None
+
+        if self._depth == self._source_depth:
+            self._source_depth = None
+        elif self._depth == self._unit_depth:
+            self._unit_depth = None
+            if self._has_source:
+                self._count_unit()
+
+        self._depth -= 1
+
+    def _count_unit(self):
+        texts = [''.join(parts) for parts in self._texts]
+        self.total_units += 1
+
+        if self._datatype == 'x-DocumentState':
+            self.styled_units += 1
+            if not self._preserve:
+                texts = [' '.join(text.split()) for text in texts]
+            self.total_characters += len(SEG_SEPARATOR.join(texts))
+        else:
+            self.plaintext_units += 1
+            text = texts[0]
+            self.total_characters += len(text if self._preserve else text.strip())
+
+    def close(self) -> Dict:
+        return {
+            'total_units': self.total_units,
+            'plaintext_units': self.plaintext_units,
+            'styled_units': self.styled_units,
+            'total_characters': self.total_characters
+        }
 
 
 class XLFParser:
@@ -36,65 +166,196 @@ class XLFParser:
     
     # Namespace for XLF 1.2
     NS = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
-    
+
+    # libxml2 options for every parse of the file: keep whitespace and CDATA
+    # as-is, skip the id hash table (never queried) and allow very large exports
+    _PARSER_OPTIONS = {
+        'remove_blank_text': False,
+        'strip_cdata': False,
+        'collect_ids': False,
+        'huge_tree': True
+    }
+
     def __init__(self, xlf_path: str):
         """
         Initialize parser with XLF file path
+
+        Only the file header is read here; the full tree is built on first
+        access to .tree/.root (or by parse_all_units).
         
         Args:
             xlf_path: Path to the XLF file
         """
         self.xlf_path = xlf_path
-        self.tree = None
-        self.root = None
-        self._load_file()
+        self._tree = None
+        self._root = None
+        self._units = None  # Memoised result of parse_all_units()
+        self._statistics = None  # Memoised result of get_statistics()
+        self._unpaired = None  # Memoised result of find_unpaired_tags()
+        self._file_attrib = self._read_header()
+
+    @property
+    def tree(self) -> etree._ElementTree:
+        """Full document tree (loaded on first use)"""
+        if self._tree is None:
+            self._load_file()
+        return self._tree
+
+    @property
+    def root(self) -> etree._Element:
+        """Root <xliff> element (loaded on first use)"""
+        if self._root is None:
+            self._load_file()
+        return self._root
+
+    def _iterparse(self, events: Tuple[str, ...], tag: str, source=None):
+        """iterparse with the same options the full parse uses"""
+        return etree.iterparse(
+            source if source is not None else self.xlf_path, events=events, tag=tag,
+            **self._PARSER_OPTIONS
+        )
+
+    def _read_header(self) -> Dict[str, str]:
+        """
+        Read the attributes of the first <file> element, then stop
+
+        The file is opened here so it is closed as soon as the header has been
+        seen, leaving the rest of the document unread.
+        """
+        try:
+            with open(self.xlf_path, 'rb') as stream:
+                for _, elem in self._iterparse(('start',), _TAG_FILE, stream):
+                    return dict(elem.attrib)
+        except etree.XMLSyntaxError as e:
+            raise ValueError(f"Invalid XML in XLF file: {e}")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"XLF file not found: {self.xlf_path}")
+        return {}
     
     def _load_file(self):
         """Load and parse the XLF file"""
+        if self._tree is not None:
+            return
         try:
-            parser = etree.XMLParser(remove_blank_text=False, strip_cdata=False)
-            self.tree = etree.parse(self.xlf_path, parser)
-            self.root = self.tree.getroot()
+            parser = etree.XMLParser(**self._PARSER_OPTIONS)
+            tree = etree.parse(self.xlf_path, parser)
         except etree.XMLSyntaxError as e:
             raise ValueError(f"Invalid XML in XLF file: {e}")
         except FileNotFoundError:
             raise FileNotFoundError(f"XLF file not found: {self.xlf_path}")
+        self._root = tree.getroot()
+        self._tree = tree
     
     def get_source_language(self) -> str:
         """Extract source language from file element"""
-        file_elem = self.root.find('.//xliff:file', self.NS)
-        if file_elem is not None:
-            return file_elem.get('source-language', 'unknown')
-        return 'unknown'
+        return self._file_attrib.get('source-language', 'unknown')
     
     def get_target_language(self) -> Optional[str]:
         """Extract target language if specified"""
-        file_elem = self.root.find('.//xliff:file', self.NS)
-        if file_elem is not None:
-            return file_elem.get('target-language')
-        return None
+        return self._file_attrib.get('target-language')
+
+    def _safe_parse_trans_unit(self, unit: etree._Element) -> Optional[TransUnit]:
+        """_parse_trans_unit that reports failures instead of raising"""
+        try:
+            return self._parse_trans_unit(unit)
+        except Exception as e:
+            unit_id = unit.get('id', 'unknown')
+            logger.warning("Failed to parse trans-unit %s: %s", unit_id, e)
+            return None
     
     def parse_all_units(self) -> List[TransUnit]:
         """
         Parse all trans-units from the XLF file
+
+        If the tree has not been loaded yet, it is built by the same
+        iterparse pass that extracts the units, so the file is read and
+        walked only once. Later calls return the same list.
         
         Returns:
             List of TransUnit objects ready for translation
         """
-        trans_units = self.root.findall('.//xliff:trans-unit', self.NS)
+        if self._units is not None:
+            return self._units
+
+        if self._tree is None:
+            parsed_units = []
+            # Bound once instead of looked up on every iteration
+            parse = self._safe_parse_trans_unit
+            append = parsed_units.append
+            try:
+                context = self._iterparse(('end',), _TAG_TU)
+                for _, unit in context:
+                    parsed = parse(unit)
+                    if parsed:
+                        append(parsed)
+            except etree.XMLSyntaxError as e:
+                raise ValueError(f"Invalid XML in XLF file: {e}")
+
+            # The elements are kept, so this is the complete document
+            self._root = context.root
+            self._tree = context.root.getroottree()
+            self._units = parsed_units
+            return parsed_units
+
+        trans_units = self.root.iter(_TAG_TU)
         parsed_units = []
+        parse = self._safe_parse_trans_unit
+        append = parsed_units.append
         
         for unit in trans_units:
-            try:
-                parsed = self._parse_trans_unit(unit)
-                if parsed:
-                    parsed_units.append(parsed)
-            except Exception as e:
-                unit_id = unit.get('id', 'unknown')
-                print(f"Warning: Failed to parse trans-unit {unit_id}: {e}")
+            parsed = parse(unit)
+            if parsed:
+                append(parsed)
         
+        self._units = parsed_units
         return parsed_units
+
+    def iter_units(self) -> Iterator[TransUnit]:
+        """
+        Stream trans-units with bounded memory
+
+        Each <trans-unit> (and any earlier siblings) is freed after it has
+        been yielded, so the yielded TransUnit's elements are only valid until
+        the next iteration. Use parse_all_units() when the elements are needed
+        afterwards (e.g. by XLFWriter).
+
+        The <bpt>/<ept> pairing of each unit is checked on the way, so a
+        complete pass also answers find_unpaired_tags() without a second read.
+
+        Yields:
+            TransUnit for each trans-unit with a <source>
+        """
+        unpaired = []
+        try:
+            for _, elem in self._iterparse(('end',), _TAG_TU):
+                parsed = self._safe_parse_trans_unit(elem)
+                if parsed:
+                    is_valid, error = self.validate_tag_pairing(parsed.source_element)
+                    if not is_valid:
+                        unpaired.append((parsed.id or 'unknown', error))
+                    yield parsed
+
+                # Free the processed element and any earlier siblings
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        except etree.XMLSyntaxError as e:
+            raise ValueError(f"Invalid XML in XLF file: {e}")
+
+        self._unpaired = unpaired
     
+    def iter_units_preview(self) -> Iterator[UnitPreview]:
+        """
+        Stream lightweight previews of all trans-units
+
+        Used for statistics and previews before committing to a full parse.
+
+        Yields:
+            UnitPreview for each trans-unit with a <source>
+        """
+        for unit in self.iter_units():
+            yield UnitPreview(unit.id, unit.datatype, unit.translatable_text)
+
     def _parse_trans_unit(self, unit: etree._Element) -> Optional[TransUnit]:
         """
         Parse a single trans-unit element
@@ -107,11 +368,11 @@ class XLFParser:
         """
         unit_id = unit.get('id')
         datatype = unit.get('datatype', 'plaintext')
-        xml_space = unit.get('{http://www.w3.org/XML/1998/namespace}space')
+        xml_space = unit.get(_ATTR_XML_SPACE)
         preserve_space = xml_space == 'preserve'
         
         # Find the source element
-        source = unit.find('xliff:source', self.NS)
+        source = unit.find(_TAG_SOURCE)
         if source is None:
             return None
         
@@ -137,7 +398,7 @@ class XLFParser:
             id=unit_id,
             datatype='plaintext',
             source_element=source,
-            translatable_text=text.strip() if not preserve_space else text,
+            segments=(text.strip() if not preserve_space else text,),
             has_inline_tags=False,
             xml_space_preserve=preserve_space,
             tag_map={},
@@ -156,7 +417,7 @@ class XLFParser:
         3. Keep track of boundaries for splitting after translation
         """
         # Find all <g> tags with translatable content
-        g_tags = source.findall('.//xliff:g[@ctype="x-text"]', self.NS)
+        g_tags = [g for g in source.iter(_TAG_G) if g.get('ctype') == 'x-text']
         
         if not g_tags:
             # No translatable content
@@ -164,46 +425,39 @@ class XLFParser:
                 id=unit_id,
                 datatype='x-DocumentState',
                 source_element=source,
-                translatable_text='',
+                segments=(),
                 has_inline_tags=True,
                 xml_space_preserve=preserve_space,
                 tag_map={},
                 g_segments=[]
             )
         
-        # Extract text and metadata from each <g> segment
-        g_segments = []
-        text_parts = []
-        
-        for idx, g_tag in enumerate(g_tags):
-            text = g_tag.text or ''
-            
-            # Handle &#xD; (carriage return) and other XML entities
-            if preserve_space:
-                # Keep whitespace as-is
-                clean_text = text
-            else:
-                # Normalize whitespace but preserve intentional breaks
-                clean_text = re.sub(r'\s+', ' ', text).strip()
-            
-            g_segments.append({
-                'index': idx,
-                'element': g_tag,
-                'original_text': text,
-                'char_count': len(clean_text)
-            })
-            
-            text_parts.append(clean_text)
+        # Extract text from each <g> segment (entities such as &#xD; are
+        # already resolved by the XML parser)
+        texts = [g_tag.text or '' for g_tag in g_tags]
+
+        # Whitespace handling is decided once per unit, not per segment
+        if preserve_space:
+            # Keep whitespace as-is
+            clean_texts = texts
+        else:
+            # Normalize whitespace but preserve intentional breaks
+            # (split() collapses whitespace runs and trims both ends)
+            clean_texts = [' '.join(text.split()) for text in texts]
+
+        g_segments = [
+            GSegment(idx, g_tag, text)
+            for idx, (g_tag, text) in enumerate(zip(g_tags, texts))
+        ]
         
-        # Merge all text segments with a separator
-        # Use a special marker to track segment boundaries
-        merged_text = ' __SEG__ '.join(text_parts)
+        # Segment boundaries are kept out-of-band; translatable_text merges
+        # them with __SEG__ markers only when the string is needed
         
         return TransUnit(
             id=unit_id,
             datatype='x-DocumentState',
             source_element=source,
-            translatable_text=merged_text,
+            segments=tuple(clean_texts),
             has_inline_tags=True,
             xml_space_preserve=preserve_space,
             tag_map={},
@@ -213,15 +467,24 @@ class XLFParser:
     def validate_tag_pairing(self, source: etree._Element) -> Tuple[bool, str]:
         """
         Validate that all <bpt> and <ept> tags are properly paired
+
+        Tags are matched on rid when present (XLIFF 1.2 links a pair through
+        rid when the ids differ), otherwise on id.
         
         Returns:
             (is_valid, error_message)
         """
-        bpt_tags = source.findall('.//xliff:bpt', self.NS)
-        ept_tags = source.findall('.//xliff:ept', self.NS)
-        
-        bpt_ids = {tag.get('id') for tag in bpt_tags}
-        ept_ids = {tag.get('id') for tag in ept_tags}
+        # One walk over both tag kinds
+        bpt_ids = set()
+        ept_ids = set()
+        add_bpt = bpt_ids.add
+        add_ept = ept_ids.add
+        for tag in source.iter(_TAG_BPT, _TAG_EPT):
+            key = tag.get('rid') or tag.get('id')
+            if tag.tag == _TAG_BPT:
+                add_bpt(key)
+            else:
+                add_ept(key)
         
         if bpt_ids != ept_ids:
             missing_epts = bpt_ids - ept_ids
@@ -235,6 +498,40 @@ class XLFParser:
         
         return True, ""
     
+    def find_unpaired_tags(self) -> List[Tuple[str, str]]:
+        """
+        Validate <bpt>/<ept> pairing for the whole file
+
+        Answered from the last complete iter_units() pass when there was one
+        (e.g. the preview in main.py), so the check never forces the full tree
+        to load. Otherwise the units are checked in memory if the tree is
+        already loaded, or streamed once.
+
+        Returns:
+            List of (unit_id, error_message) for units with unpaired tags
+        """
+        if self._unpaired is None:
+            if self._tree is not None:
+                errors = []
+                for unit in self.parse_all_units():
+                    is_valid, error = self.validate_tag_pairing(unit.source_element)
+                    if not is_valid:
+                        errors.append((unit.id or 'unknown', error))
+                self._unpaired = errors
+            else:
+                for _ in self.iter_units():
+                    pass
+
+        return self._unpaired
+
+    def _stats_via_target(self) -> Dict:
+        """Count units and characters with a target parser (no tree built)"""
+        parser = etree.XMLParser(target=StatsTarget(), **self._PARSER_OPTIONS)
+        try:
+            return etree.parse(self.xlf_path, parser)
+        except etree.XMLSyntaxError as e:
+            raise ValueError(f"Invalid XML in XLF file: {e}")
+
     def get_statistics(self) -> Dict:
         """
         Get statistics about the XLF file
@@ -242,23 +539,32 @@ class XLFParser:
         Returns:
             Dictionary with counts and metadata
         """
-        units = self.parse_all_units()
-        
-        plaintext_count = sum(1 for u in units if u.datatype == 'plaintext')
-        styled_count = sum(1 for u in units if u.datatype == 'x-DocumentState')
-        
-        total_chars = sum(len(u.translatable_text) for u in units)
-        avg_chars = total_chars / len(units) if units else 0
+        if self._statistics is not None:
+            return self._statistics
+
+        if self._units is not None:
+            # Units are already parsed: a single pass over them is cheapest
+            counts = {'total_units': len(self._units), 'plaintext_units': 0,
+                      'styled_units': 0, 'total_characters': 0}
+            for u in self._units:
+                if u.datatype == 'plaintext':
+                    counts['plaintext_units'] += 1
+                elif u.datatype == 'x-DocumentState':
+                    counts['styled_units'] += 1
+                counts['total_characters'] += len(u.translatable_text)
+        else:
+            counts = self._stats_via_target()
+
+        total_units = counts['total_units']
+        avg_chars = counts['total_characters'] / total_units if total_units else 0
         
-        return {
-            'total_units': len(units),
-            'plaintext_units': plaintext_count,
-            'styled_units': styled_count,
-            'total_characters': total_chars,
+        self._statistics = {
+            **counts,
             'avg_characters_per_unit': round(avg_chars, 2),
             'source_language': self.get_source_language(),
             'target_language': self.get_target_language() or 'not specified'
         }
+        return self._statistics
 
 
 def main():
@@ -9,15 +9,151 @@ Sends translatable text to OpenAI API with proper handling of:
 """
 
 import os
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import re
+import sys
+import json
+import asyncio
+import random
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field, replace
 import time
 
 try:
-    from openai import OpenAI
+    import httpx
+    import openai
+    from openai import OpenAI, AsyncOpenAI
 except ImportError:
     print("Warning: openai package not installed. Run: pip install openai")
+    openai = None
     OpenAI = None
+    AsyncOpenAI = None
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional: faster decoding of (often non-ASCII) batch responses.
+# Its JSONDecodeError subclasses json.JSONDecodeError, so handlers are shared.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# tiktoken is optional: exact token counts for batch packing and rate limits
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Batches of short strings (button labels, menu items) may hold up to
+# PACKED_BATCH_SIZE units so the fixed prompt overhead is spread further
+SHORT_UNIT_CHARS = 60
+PACKED_BATCH_SIZE = 100
+
+# Upper bound for the per-unit output cap, which doubles on truncation
+MAX_COMPLETION_TOKENS = 8000
+
+# Output cap for one batch request
+BATCH_COMPLETION_TOKENS = 4000
+
+# Model refusals/apologies that must never end up in the target file. Only
+# matched at the start of the response (optionally after "Sorry, but"), so
+# UI text like "I can't log in" inside a translation is not a refusal
+REFUSAL_ERROR = "Translation contains refusal language"
+_REFUSAL_RE = re.compile(
+    r"\s*(?:(?:I'm\s+)?sorry[,.]?\s+(?:but\s+)?)?"
+    r"(?:I\s+(?:cannot|can't|apologize|won't|am\s+unable)|as\s+an\s+AI)\b",
+    re.IGNORECASE
+)
+
+
+# Fixed sections of the system prompt (see _system_prompt)
+PROMPT_INTRO = (
+    "You are a professional translator specializing in UI and e-learning content. "
+    "You follow instructions precisely and preserve all formatting markers.\n"
+    "\n"
+    "Translate the user's text from English (EN-UK) to {target_language}.\n"
+    "\n"
+)
+
+CONTEXT_RULES = (
+    "CONTEXT:\n"
+    "This is training material for retail sales associates.\n"
+    "Use an informal, friendly tone throughout.\n"
+    "Ensure consistency in terminology and translations across all segments.\n"
+    "Adapt idioms naturally to the target language rather than translating literally.\n"
+    "Maintain consistent formality level (informal 'you' form where applicable).\n"
+)
+
+SEG_RULES = (
+    "CRITICAL RULES:\n"
+    "1. The text may contain __SEG__ markers. These are STRUCTURAL MARKERS.\n"
+    "   - You MUST preserve EVERY __SEG__ marker EXACTLY as-is\n"
+    "   - Do NOT translate, modify, move, or remove __SEG__ markers\n"
+    "   - Keep __SEG__ in the EXACT SAME POSITIONS in the translation\n"
+    "\n"
+)
+
+PRESERVE_RULE = "2. Never translate terms in <<<PRESERVE:{terms}>>>; copy them verbatim.\n\n"
+
+WHITESPACE_RULES = (
+    "3. PRESERVE ALL WHITESPACE:\n"
+    "   - If source text ends with a space, translation MUST end with a space\n"
+    "   - If source text starts with a space, translation MUST start with a space\n"
+    "   - Preserve line breaks (\\n, \\r\\n) exactly\n"
+    "   - This is CRITICAL for proper text rendering in Storyline\n"
+    "   - Text segments in Storyline don't auto-space, so missing spaces cause words to run together\n"
+    "\n"
+    "4. OUTPUT FORMAT:\n"
+)
+
+BATCH_OUTPUT_RULES = (
+    "   - The user sends a JSON object of numbered text units\n"
+    "   - Return valid JSON only - no other text\n"
+    "   - Return a JSON object with exactly the same keys, each value translated"
+)
+
+SINGLE_OUTPUT_RULES = (
+    "   - The user message is the text to translate\n"
+    "   - Provide ONLY the translated text\n"
+    "   - No explanations, no notes, no markdown formatting\n"
+    "   - Just the pure translation"
+)
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """Tokenizer used by current OpenAI chat models, or None if unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Encoding files could not be loaded (e.g. offline)
+        return None
+
+
+@lru_cache(maxsize=64)
+def _system_prompt(target_language: str,
+                   preserve_terms: Tuple[str, ...],
+                   custom_context: str,
+                   batch: bool) -> str:
+    """Cached body of XLFTranslator._build_system_prompt (hashable args only)"""
+    # Default context, plus the custom context if provided
+    custom = f"\n{custom_context}\n" if custom_context else ""
+    # Compact, sorted term list so the prefix stays short and stable
+    terms = PRESERVE_RULE.format(terms="|".join(preserve_terms)) if preserve_terms else ""
+    output = BATCH_OUTPUT_RULES if batch else SINGLE_OUTPUT_RULES
+
+    return (
+        f"{PROMPT_INTRO.format(target_language=target_language)}"
+        f"{CONTEXT_RULES}{custom}\n"
+        f"{SEG_RULES}{terms}{WHITESPACE_RULES}{output}"
+    )
 
 
 @dataclass
@@ -31,16 +167,137 @@ class TranslationResult:
     retry_count: int = 0
 
 
+@dataclass(slots=True)
+class TranslationStats:
+    """Running translation counters, safe to update from worker threads"""
+    total_translations: int = 0
+    successful: int = 0
+    failed: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, success: bool, retries: int = 0):
+        """Count one finished unit"""
+        with self._lock:
+            self.total_translations += 1
+            if success:
+                self.successful += 1
+            else:
+                self.failed += 1
+            self.retries += retries
+
+    def record_usage(self, prompt_tokens: int, cached_tokens: int):
+        """Accumulate prompt-cache usage reported by the API"""
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+
+    def as_dict(self) -> Dict[str, int]:
+        """Counters as a plain dict"""
+        return {
+            'total_translations': self.total_translations,
+            'successful': self.successful,
+            'failed': self.failed,
+            'retries': self.retries,
+            'prompt_tokens': self.prompt_tokens,
+            'cached_tokens': self.cached_tokens
+        }
+
+
+class RateLimiter:
+    """
+    Token bucket for requests-per-minute and tokens-per-minute limits
+
+    Both buckets refill continuously. Callers only wait when a bucket is
+    short, instead of sleeping a fixed time before every call. Safe to share
+    between the event loop and worker threads.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take capacity for one request, or return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.last_update
+            self.last_update = now
+
+            self.available_request_capacity = min(
+                self.max_requests_per_minute,
+                self.available_request_capacity + elapsed * self.max_requests_per_minute / 60
+            )
+            self.available_token_capacity = min(
+                self.max_tokens_per_minute,
+                self.available_token_capacity + elapsed * self.max_tokens_per_minute / 60
+            )
+
+            # A request larger than the whole bucket waits for a full bucket
+            tokens = min(tokens, self.max_tokens_per_minute)
+
+            if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                self.available_request_capacity -= 1
+                self.available_token_capacity -= tokens
+                return 0.0
+
+            request_wait = (1 - self.available_request_capacity) * 60 / self.max_requests_per_minute
+            token_wait = (tokens - self.available_token_capacity) * 60 / self.max_tokens_per_minute
+            return max(request_wait, token_wait, 0.0)
+
+    def sync(self, remaining_requests: Optional[int], remaining_tokens: Optional[int]):
+        """Never assume more capacity than the API reports as remaining"""
+        with self._lock:
+            if remaining_requests is not None:
+                self.available_request_capacity = min(self.available_request_capacity,
+                                                      float(remaining_requests))
+            if remaining_tokens is not None:
+                self.available_token_capacity = min(self.available_token_capacity,
+                                                    float(remaining_tokens))
+
+    def update_limits(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        """Switch to new limits, keeping the current fill level within them"""
+        with self._lock:
+            self.max_requests_per_minute = max_requests_per_minute
+            self.max_tokens_per_minute = max_tokens_per_minute
+            self.available_request_capacity = min(self.available_request_capacity,
+                                                  float(max_requests_per_minute))
+            self.available_token_capacity = min(self.available_token_capacity,
+                                                float(max_tokens_per_minute))
+
+    def wait(self, tokens: int):
+        """Block until a request of 'tokens' estimated tokens may be sent"""
+        while (delay := self._reserve(tokens)) > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, tokens: int):
+        """Async version of wait() that yields to the event loop"""
+        while (delay := self._reserve(tokens)) > 0:
+            await asyncio.sleep(delay)
+
+
 class XLFTranslator:
     """Translator for XLF content using OpenAI API"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-5.1"):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 model: str = "gpt-5.1",
+                 max_requests_per_minute: Optional[int] = None,
+                 max_tokens_per_minute: Optional[int] = None):
         """
         Initialize translator with API key
 
         Args:
             api_key: OpenAI API key (or set OPENAI_API_KEY env var)
             model: OpenAI model to use (default: gpt-5.1)
+            max_requests_per_minute: Request rate limit (default: XLF_MAX_RPM or 500)
+            max_tokens_per_minute: Token rate limit (default: XLF_MAX_TPM or 200000)
         """
         if OpenAI is None:
             raise ImportError("openai package required. Install with: pip install openai")
@@ -49,15 +306,50 @@ class XLFTranslator:
         if not self.api_key:
             raise ValueError("API key required. Set OPENAI_API_KEY or pass api_key parameter")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # Long-lived HTTP/2 pool for the sync client so connections that sit
+        # idle between batches are reused instead of re-handshaking TLS
+        self._http = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32,
+                                max_connections=64,
+                                keepalive_expiry=300),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        self.client = OpenAI(api_key=self.api_key, http_client=self._http)
         self.model = model
-        self.stats = {
-            'total_translations': 0,
-            'successful': 0,
-            'failed': 0,
-            'retries': 0
-        }
+        # Explicit limits win over the ones reported by the API (see warm_up)
+        self._configured_rpm = max_requests_per_minute or os.getenv('XLF_MAX_RPM')
+        self._configured_tpm = max_tokens_per_minute or os.getenv('XLF_MAX_TPM')
+        self.rate_limiter = RateLimiter(
+            int(self._configured_rpm or 500),
+            int(self._configured_tpm or 200000)
+        )
+        # Successful translations from this process, keyed by _memo_key()
+        self._memo: Dict[tuple, str] = {}
+        self.stats = TranslationStats()
     
+    def warm_up(self):
+        """
+        Open the API connection and adopt the account's real rate limits
+
+        Sends a minimal completion so the TLS handshake is done before the
+        first real request, and reads the x-ratelimit-limit-* response
+        headers. Limits set through arguments or XLF_MAX_RPM / XLF_MAX_TPM
+        are left alone.
+        """
+        raw = self.client.chat.completions.with_raw_response.create(
+            model=self.model,
+            messages=[{"role": "user", "content": "."}],
+            max_completion_tokens=1
+        )
+        rpm = raw.headers.get('x-ratelimit-limit-requests')
+        tpm = raw.headers.get('x-ratelimit-limit-tokens')
+
+        self.rate_limiter.update_limits(
+            int(rpm) if rpm and not self._configured_rpm else self.rate_limiter.max_requests_per_minute,
+            int(tpm) if tpm and not self._configured_tpm else self.rate_limiter.max_tokens_per_minute
+        )
+
     def translate_unit(self,
                       text: str,
                       unit_id: str,
@@ -90,32 +382,61 @@ class XLFTranslator:
                 error_message="Empty text, skipped translation"
             )
         
+        memo_key = self._memo_key(text, target_language, preserve_terms, custom_context)
+        if memo_key in self._memo:
+            return TranslationResult(
+                success=True,
+                translated_text=self._memo[memo_key],
+                original_text=text,
+                unit_id=unit_id
+            )
+        
         retry_count = 0
         last_error = None
+
+        # Stable system prefix; only the user message varies per unit
+        system_prompt = self._build_system_prompt(
+            target_language=target_language,
+            preserve_terms=preserve_terms,
+            custom_context=custom_context,
+            batch=False
+        )
+        
+        text_tokens = self._estimate_tokens(text)
+        request_tokens = self._estimate_tokens(system_prompt) + text_tokens
+        max_completion_tokens = self._completion_cap(text_tokens)
         
         while retry_count <= max_retries:
             try:
-                # Build the prompt
-                prompt = self._build_prompt(
-                    text=text,
-                    target_language=target_language,
-                    has_seg_markers=has_seg_markers,
-                    preserve_terms=preserve_terms,
-                    custom_context=custom_context
-                )
-                
-                # Call OpenAI API
-                response = self.client.chat.completions.create(
+                # Call OpenAI API once the rate limits allow it
+                # OpenAI counts the output cap against TPM up front, so do we
+                self.rate_limiter.wait(request_tokens + max_completion_tokens)
+                raw = self.client.chat.completions.with_raw_response.create(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": "You are a professional translator specializing in UI and e-learning content. You follow instructions precisely and preserve all formatting markers."},
-                        {"role": "user", "content": prompt}
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": text}
                     ],
                     temperature=0.3,  # Lower temperature for more consistent translations
-                    max_completion_tokens=2000
+                    max_completion_tokens=max_completion_tokens,
+                    extra_body={"prompt_cache_key": self._prompt_cache_key(system_prompt)}
                 )
+                self._sync_rate_limits(raw.headers)
+                response = raw.parse()
+                self._record_usage(response)
+                choice = response.choices[0]
                 
-                translated_text = response.choices[0].message.content.strip()
+                if choice.finish_reason == "length":
+                    # Output was cut off; never accept a partial translation
+                    last_error = "Translation truncated (output token limit reached)"
+                    retry_count += 1
+                    if retry_count <= max_retries:
+                        max_completion_tokens = min(MAX_COMPLETION_TOKENS, max_completion_tokens * 2)
+                        logger.warning("⚠️  Retry %d/%d for unit %s: truncated, raising limit to %d tokens",
+                                       retry_count, max_retries, unit_id, max_completion_tokens)
+                    continue
+                
+                translated_text = choice.message.content.strip()
                 
                 # Validate the translation
                 is_valid, error = self._validate_translation(
@@ -125,10 +446,8 @@ class XLFTranslator:
                 )
                 
                 if is_valid:
-                    self.stats['total_translations'] += 1
-                    self.stats['successful'] += 1
-                    if retry_count > 0:
-                        self.stats['retries'] += retry_count
+                    self.stats.record(True, retry_count)
+                    self._memo[memo_key] = translated_text
                     
                     return TranslationResult(
                         success=True,
@@ -140,43 +459,96 @@ class XLFTranslator:
                 else:
                     # Validation failed, retry with stricter prompt
                     last_error = f"Validation failed: {error}"
+                    if error == REFUSAL_ERROR and retry_count >= 1:
+                        # Refused twice: the same prompt keeps getting the same
+                        # refusal, so keep the source text
+                        logger.warning("⚠️  Model refused unit %s again, keeping source text", unit_id)
+                        break
                     retry_count += 1
                     if retry_count <= max_retries:
-                        print(f"⚠️  Retry {retry_count}/{max_retries} for unit {unit_id}: {error}")
+                        logger.warning("⚠️  Retry %d/%d for unit %s: %s", retry_count, max_retries, unit_id, error)
                         time.sleep(1)  # Brief delay before retry
                     
             except Exception as e:
                 last_error = str(e)
+                delay = self._retry_delay(e, retry_count + 1)
+                if delay is None:
+                    # Retrying won't help (bad key, invalid request, ...)
+                    break
                 retry_count += 1
                 if retry_count <= max_retries:
-                    print(f"⚠️  API error, retry {retry_count}/{max_retries} for unit {unit_id}: {e}")
-                    time.sleep(2)  # Longer delay for API errors
+                    logger.warning("⚠️  API error, retry %d/%d for unit %s in %.1fs: %s",
+                                   retry_count, max_retries, unit_id, delay, e)
+                    time.sleep(delay)
         
-        # All retries exhausted
-        self.stats['total_translations'] += 1
-        self.stats['failed'] += 1
+        # All retries exhausted (or not worth retrying)
+        self.stats.record(False)
         
         return TranslationResult(
             success=False,
             translated_text=text,  # Return original as fallback
             original_text=text,
             unit_id=unit_id,
-            error_message=f"Translation failed after {max_retries} retries: {last_error}",
+            error_message=f"Translation failed after {retry_count} retries: {last_error}",
             retry_count=retry_count
         )
     
+    @staticmethod
+    def _completion_cap(text_tokens: int) -> int:
+        """Initial output cap for one unit"""
+        # Leave room for languages that expand (and for reasoning tokens)
+        return min(MAX_COMPLETION_TOKENS, max(2000, 4 * text_tokens))
+
+    @staticmethod
+    def _memo_key(text: str,
+                  target_language: str,
+                  preserve_terms: Optional[List[str]],
+                  custom_context: Optional[str]) -> tuple:
+        """Everything besides the model that affects a translation"""
+        return (text, target_language, tuple(sorted(preserve_terms or [])), custom_context or '')
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retry number 'attempt' after an API error
+
+        Exponential backoff with jitter, honouring Retry-After on rate
+        limits. Returns None for errors that a retry cannot fix.
+        """
+        if openai is not None:
+            if isinstance(error, (openai.AuthenticationError, openai.PermissionDeniedError,
+                                  openai.BadRequestError, openai.NotFoundError)):
+                return None
+
+            if isinstance(error, openai.RateLimitError):
+                response = getattr(error, 'response', None)
+                retry_after = response.headers.get('retry-after') if response is not None else None
+                try:
+                    return float(retry_after) + random.uniform(0, 1)
+                except (TypeError, ValueError):
+                    return 2 ** attempt + random.uniform(0, 1)
+
+        # Timeouts, 5xx, connection errors and anything unexpected
+        return min(60, 2 ** attempt) + random.random()
+    
     def translate_batch(self,
                        units: List[Dict],
                        target_language: str,
                        preserve_terms: Optional[List[str]] = None,
                        custom_context: Optional[str] = None,
-                       batch_size: int = 10,
-                       use_batch_mode: bool = True) -> List[TranslationResult]:
+                       batch_size: int = 20,
+                       use_batch_mode: bool = True,
+                       max_concurrency: int = 16,
+                       max_batch_tokens: int = 3000,
+                       use_batch_api: bool = False) -> List[TranslationResult]:
         """
         Translate multiple units with intelligent batching
 
         With batch_mode=True (default):
-        - Sends up to 'batch_size' units per API call
+        - Sends up to 'batch_size' units per API call, capped at
+          roughly 'max_batch_tokens' input tokens per call
+        - Batches of short strings are packed up to PACKED_BATCH_SIZE units
+        - Up to 'max_concurrency' batches in flight at once
         - 5-10x faster than one-by-one
         - 30-40% cheaper (shared prompt overhead)
         - Better consistency across related units
@@ -184,17 +556,29 @@ class XLFTranslator:
         With batch_mode=False:
         - Translates one unit at a time (safer, slower)
 
+        With use_batch_api=True:
+        - Submits everything as one OpenAI Batch API job
+          (see translate_via_batch_api: 50% cheaper, up to 24h)
+
         Args:
             units: List of dicts with keys: 'text', 'id', 'has_seg_markers'
             target_language: Target language
             preserve_terms: Terms to preserve across all units
             custom_context: Additional context/rules to include in prompts
-            batch_size: Number of units per API call (default: 10)
+            batch_size: Maximum number of units per API call (default: 20)
             use_batch_mode: Use optimized batching (default: True)
+            max_concurrency: Maximum concurrent API calls in batch mode (default: 16)
+            max_batch_tokens: Approximate input token budget per batch (default: 3000)
+            use_batch_api: Use the asynchronous Batch API instead (default: False)
 
         Returns:
             List of TranslationResult objects
         """
+        if use_batch_api:
+            return self.translate_via_batch_api(
+                units, target_language, preserve_terms, custom_context
+            )
+
         if not use_batch_mode or batch_size == 1:
             # Fall back to one-by-one translation
             return self._translate_sequential(
@@ -203,7 +587,8 @@ class XLFTranslator:
 
         # Optimized batch translation
         return self._translate_batched(
-            units, target_language, preserve_terms, custom_context, batch_size
+            units, target_language, preserve_terms, custom_context,
+            batch_size, max_concurrency, max_batch_tokens
         )
 
     def _translate_sequential(self,
@@ -215,7 +600,7 @@ class XLFTranslator:
         results = []
 
         for i, unit in enumerate(units):
-            print(f"Translating {i+1}/{len(units)}: {unit['id']}")
+            logger.info("Translating %d/%d: %s", i + 1, len(units), unit['id'])
 
             result = self.translate_unit(
                 text=unit['text'],
@@ -228,10 +613,6 @@ class XLFTranslator:
 
             results.append(result)
 
-            # Brief pause to avoid rate limits
-            if i < len(units) - 1:
-                time.sleep(0.5)
-
         return results
 
     def _translate_batched(self,
@@ -239,41 +620,146 @@ class XLFTranslator:
                           target_language: str,
                           preserve_terms: Optional[List[str]],
                           custom_context: Optional[str],
-                          batch_size: int) -> List[TranslationResult]:
+                          batch_size: int,
+                          max_concurrency: int,
+                          max_batch_tokens: int) -> List[TranslationResult]:
         """
         Optimized batch translation - multiple units per API call
 
         Performance improvements:
         - 5-10x faster (fewer API calls)
+        - Batches are dispatched concurrently, bounded by a semaphore
         - 30-40% cheaper (shared system prompt)
         - Consistent terminology across batch
         """
-        all_results = []
-        total_batches = (len(units) + batch_size - 1) // batch_size
+        batches = self._make_batches(units, batch_size, max_batch_tokens)
 
-        print(f"Using batch mode: {batch_size} units per API call ({total_batches} batches)")
+        logger.info("Using batch mode: up to %d units per API call (%d batches, up to %d in flight)",
+                    batch_size, len(batches), max_concurrency)
 
-        # Process units in batches
-        for batch_idx in range(0, len(units), batch_size):
-            batch = units[batch_idx:batch_idx + batch_size]
-            batch_num = (batch_idx // batch_size) + 1
+        return asyncio.run(self._translate_batches_async(
+            batches, target_language, preserve_terms, custom_context, max_concurrency
+        ))
 
-            print(f"\nBatch {batch_num}/{total_batches} ({len(batch)} units)...")
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """
+        Token count for text
+
+        Exact when tiktoken is installed, otherwise a rough estimate
+        (~4 characters per token for English).
+        """
+        encoding = _token_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=())) + 1
+        return len(text) // 4 + 1
+
+    def _make_batches(self,
+                      units: List[Dict],
+                      max_units: int,
+                      max_tokens: int) -> List[List[Dict]]:
+        """
+        Group consecutive units into batches
+
+        A batch is closed when it reaches 'max_units' units or when adding the
+        next unit would exceed 'max_tokens' estimated input tokens. A single
+        unit larger than the budget still gets a batch of its own.
+
+        While the average text in a batch is shorter than SHORT_UNIT_CHARS,
+        the unit limit is raised to PACKED_BATCH_SIZE (the token budget
+        still applies).
+        """
+        batches = []
+        current = []
+        current_tokens = 0
+        current_chars = 0
+        packed_units = max(max_units, PACKED_BATCH_SIZE)
+
+        for unit in units:
+            tokens = self._estimate_tokens(unit['text'])
+
+            if current:
+                short = current_chars < SHORT_UNIT_CHARS * len(current)
+                limit = packed_units if short else max_units
+                if len(current) >= limit or current_tokens + tokens > max_tokens:
+                    batches.append(current)
+                    current = []
+                    current_tokens = 0
+                    current_chars = 0
+
+            current.append(unit)
+            current_tokens += tokens
+            current_chars += len(unit['text'])
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    async def _translate_batches_async(self,
+                                       batches: List[List[Dict]],
+                                       target_language: str,
+                                       preserve_terms: Optional[List[str]],
+                                       custom_context: Optional[str],
+                                       max_concurrency: int) -> List[TranslationResult]:
+        """Run all batches concurrently and return results in original unit order"""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        # One thread pool per run for the blocking per-unit fallback
+        # (asyncio.to_thread); shut down when the run finishes
+        with ThreadPoolExecutor(max_workers=int(os.getenv('XLF_THREAD_POOL_SIZE', '32'))) as executor:
+            asyncio.get_running_loop().set_default_executor(executor)
+
+            # One HTTP/2 connection pool for the whole run: a single TLS session
+            # with requests multiplexed over it instead of a handshake per call
+            http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+                timeout=httpx.Timeout(60, connect=5)
+            )
+
+            try:
+                aclient = AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+                batch_results = await asyncio.gather(*[
+                    self._translate_batch_bounded(
+                        semaphore, aclient, batch_num, len(batches), batch,
+                        target_language, preserve_terms, custom_context
+                    )
+                    for batch_num, batch in enumerate(batches, start=1)
+                ])
+            finally:
+                await http_client.aclose()
+
+        return [result for results in batch_results for result in results]
+
+    async def _translate_batch_bounded(self,
+                                       semaphore: asyncio.Semaphore,
+                                       aclient,
+                                       batch_num: int,
+                                       total_batches: int,
+                                       batch: List[Dict],
+                                       target_language: str,
+                                       preserve_terms: Optional[List[str]],
+                                       custom_context: Optional[str]) -> List[TranslationResult]:
+        """Translate one batch once a concurrency slot is free"""
+        async with semaphore:
+            logger.info("\nBatch %d/%d (%d units)...", batch_num, total_batches, len(batch))
 
             try:
-                # Try batch translation
-                batch_results = self._translate_single_batch(
-                    batch, target_language, preserve_terms, custom_context
+                return await self._translate_single_batch(
+                    aclient, batch, target_language, preserve_terms, custom_context
                 )
-                all_results.extend(batch_results)
 
             except Exception as e:
-                print(f"  Warning: Batch {batch_num} failed ({e})")
-                print(f"  Falling back to sequential translation for this batch...")
+                logger.warning("  Warning: Batch %d failed (%s)\n"
+                               "  Falling back to sequential translation for this batch...", batch_num, e)
 
-                # Fall back to one-by-one for this batch
+                # Fall back to one-by-one for this batch, off the event loop
+                # so the other batches keep running
+                results = []
                 for unit in batch:
-                    result = self.translate_unit(
+                    result = await asyncio.to_thread(
+                        self.translate_unit,
                         text=unit['text'],
                         unit_id=unit['id'],
                         target_language=target_language,
@@ -281,37 +767,87 @@ class XLFTranslator:
                         preserve_terms=preserve_terms,
                         custom_context=custom_context
                     )
-                    all_results.append(result)
-                    time.sleep(0.5)
-
-            # Rate limiting between batches
-            if batch_idx + batch_size < len(units):
-                time.sleep(1.0)
-
-        return all_results
-
-    def _translate_single_batch(self,
-                               batch: List[Dict],
-                               target_language: str,
-                               preserve_terms: Optional[List[str]],
-                               custom_context: Optional[str]) -> List[TranslationResult]:
+                    results.append(result)
+                return results
+
+    async def _translate_single_batch(self,
+                                      aclient,
+                                      batch: List[Dict],
+                                      target_language: str,
+                                      preserve_terms: Optional[List[str]],
+                                      custom_context: Optional[str]) -> List[TranslationResult]:
         """
         Translate a single batch of units in one API call
 
-        Uses JSON format for reliable parsing
+        Uses JSON format for reliable parsing. Units already translated by
+        this translator are answered from memory, and a text that appears
+        several times in the batch is only sent once.
         """
-        # Build batch prompt
-        batch_prompt = self._build_batch_prompt(
-            batch, target_language, preserve_terms, custom_context
-        )
+        keys = [
+            self._memo_key(unit['text'], target_language, preserve_terms, custom_context)
+            for unit in batch
+        ]
+        # Index of the first unit for each text that still needs the API
+        unique: Dict[tuple, int] = {}
+        for i, key in enumerate(keys):
+            if key not in self._memo and key not in unique:
+                unique[key] = i
+
+        results: List[Optional[TranslationResult]] = [None] * len(batch)
+        if unique:
+            sent = list(unique.values())
+            sent_results = await self._request_batch(
+                aclient, [batch[i] for i in sent],
+                target_language, preserve_terms, custom_context
+            )
+            for i, result in zip(sent, sent_results):
+                results[i] = result
+                if result.success:
+                    self._memo[keys[i]] = result.translated_text
+
+        # Fill in memo hits and in-batch duplicates
+        for i, unit in enumerate(batch):
+            if results[i] is not None:
+                continue
+            if keys[i] in self._memo:
+                results[i] = TranslationResult(
+                    success=True,
+                    translated_text=self._memo[keys[i]],
+                    original_text=unit['text'],
+                    unit_id=unit['id']
+                )
+            else:
+                # Duplicate of a unit whose translation failed
+                results[i] = replace(results[unique[keys[i]]], unit_id=unit['id'])
 
-        # Call API
-        response = self.client.chat.completions.create(
+        return results
+
+    async def _request_batch(self,
+                             aclient,
+                             batch: List[Dict],
+                             target_language: str,
+                             preserve_terms: Optional[List[str]],
+                             custom_context: Optional[str]) -> List[TranslationResult]:
+        """Send one batch request and parse the numbered JSON reply"""
+        # Stable system prefix + per-batch payload
+        system_prompt = self._build_system_prompt(
+            target_language, preserve_terms, custom_context, batch=True
+        )
+        # Count markers once; both the prompt and the response check need them
+        seg_counts = [unit['text'].count('__SEG__') for unit in batch]
+        batch_prompt = self._build_batch_prompt(batch, seg_counts)
+
+        # Call API once the rate limits allow it
+        await self.rate_limiter.wait_async(
+            self._estimate_tokens(system_prompt) + self._estimate_tokens(batch_prompt)
+            + BATCH_COMPLETION_TOKENS
+        )
+        raw = await aclient.chat.completions.with_raw_response.create(
             model=self.model,
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a professional translator specializing in UI and e-learning content. You follow instructions precisely and return valid JSON."
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
@@ -319,113 +855,239 @@ class XLFTranslator:
                 }
             ],
             temperature=0.3,
-            max_completion_tokens=4000,
-            response_format={"type": "json_object"}  # Force JSON response
+            max_completion_tokens=BATCH_COMPLETION_TOKENS,
+            response_format={"type": "json_object"},  # Force JSON response
+            extra_body={"prompt_cache_key": self._prompt_cache_key(system_prompt)}
         )
+        self._sync_rate_limits(raw.headers)
+        response = raw.parse()
+        self._record_usage(response)
+        choice = response.choices[0]
+
+        if choice.finish_reason == "length":
+            # Truncated JSON; the caller falls back to one-by-one translation
+            raise ValueError("Batch response truncated (output token limit reached)")
 
-        # Parse response
-        response_text = response.choices[0].message.content.strip()
-        batch_results = self._parse_batch_response(response_text, batch)
+        # Parse response (the JSON parser skips surrounding whitespace itself)
+        response_text = choice.message.content
+        batch_results = self._parse_batch_response(response_text, batch, seg_counts)
 
         # Update stats
+        retry = [i for i, result in enumerate(batch_results) if not result.success]
         for result in batch_results:
-            self.stats['total_translations'] += 1
             if result.success:
-                self.stats['successful'] += 1
-            else:
-                self.stats['failed'] += 1
+                self.stats.record(True)
+
+        # Units missing from the reply or failing validation get a second
+        # chance on their own (translate_unit records their stats)
+        if retry:
+            retried = await asyncio.gather(*[
+                asyncio.to_thread(
+                    self.translate_unit,
+                    text=batch[i]['text'],
+                    unit_id=batch[i]['id'],
+                    target_language=target_language,
+                    has_seg_markers=batch[i].get('has_seg_markers', False),
+                    preserve_terms=preserve_terms,
+                    custom_context=custom_context
+                )
+                for i in retry
+            ])
+            for i, result in zip(retry, retried):
+                batch_results[i] = result
 
         return batch_results
 
-    def _build_batch_prompt(self,
-                           batch: List[Dict],
-                           target_language: str,
-                           preserve_terms: Optional[List[str]],
-                           custom_context: Optional[str]) -> str:
-        """Build prompt for batch translation"""
+    def translate_via_batch_api(self,
+                                units: List[Dict],
+                                target_language: str,
+                                preserve_terms: Optional[List[str]] = None,
+                                custom_context: Optional[str] = None,
+                                poll_interval: float = 10.0,
+                                max_poll_interval: float = 300.0) -> List[TranslationResult]:
+        """
+        Translate units through the OpenAI Batch API
 
-        prompt_parts = [
-            f"Translate the following {len(batch)} text units from English (EN-UK) to {target_language}.",
-            ""
-        ]
+        Billed at 50% of the synchronous rate and not limited by the
+        synchronous RPM bucket, but results may take up to 24 hours.
+        Identical source strings are only submitted once. Results that are
+        missing, truncated or fail validation are retried via translate_unit.
 
-        # Add context (default + custom if provided)
-        context_lines = [
-            "CONTEXT:",
-            "This is training material for retail sales associates.",
-            "Use an informal, friendly tone throughout.",
-            "Ensure consistency in terminology and translations across all segments.",
-            "Adapt idioms naturally to the target language rather than translating literally.",
-            "Maintain consistent formality level (informal 'you' form where applicable)."
-        ]
+        Args:
+            units: List of dicts with keys: 'text', 'id', 'has_seg_markers'
+            target_language: Target language
+            preserve_terms: Terms to preserve across all units
+            custom_context: Additional context/rules to include in prompts
+            poll_interval: Initial delay between status checks (seconds)
+            max_poll_interval: Upper bound for the exponential poll backoff
+
+        Returns:
+            List of TranslationResult objects (same order as units)
+        """
+        system_prompt = self._build_system_prompt(
+            target_language, preserve_terms, custom_context, batch=False
+        )
+        cache_key = self._prompt_cache_key(system_prompt)
+
+        # One request per distinct text, keyed by the first unit that uses it
+        custom_ids = {}
+        seg_flags = {}
+        lines = []
+        for unit in units:
+            if unit['text'] in custom_ids:
+                continue
+            custom_ids[unit['text']] = unit['id']
+            seg_flags[unit['id']] = unit.get('has_seg_markers', False)
+            lines.append(json.dumps({
+                "custom_id": unit['id'],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": unit['text']}
+                    ],
+                    "temperature": 0.3,
+                    "max_completion_tokens": self._completion_cap(self._estimate_tokens(unit['text'])),
+                    "prompt_cache_key": cache_key
+                }
+            }, ensure_ascii=False))
 
-        if custom_context:
-            context_lines.append("")
-            context_lines.append(custom_context)
-
-        context_lines.append("")
-        prompt_parts.extend(context_lines)
-
-        # Add rules
-        prompt_parts.extend([
-            "CRITICAL RULES:",
-            "1. Return valid JSON only - no other text",
-            "2. Format: {\"translations\": [{\"id\": \"unit_id\", \"text\": \"translated text\"}, ...]}",
-            "3. Preserve __SEG__ markers EXACTLY if present (do not translate, move, or remove)",
-            "4. PRESERVE ALL WHITESPACE:",
-            "   - If source text ends with a space, translation MUST end with a space",
-            "   - If source text starts with a space, translation MUST start with a space",
-            "   - Preserve line breaks (\\n) and other whitespace characters exactly",
-            "   - This is CRITICAL for proper text rendering in Storyline",
-        ])
-
-        if preserve_terms:
-            terms_str = ", ".join(f'"{term}"' for term in preserve_terms)
-            prompt_parts.append(f"5. Do NOT translate these terms: {terms_str}")
-
-        prompt_parts.extend([
-            "",
-            "UNITS TO TRANSLATE:",
-            ""
-        ])
-
-        # Add each unit
-        for unit in batch:
-            has_seg = '__SEG__' in unit['text']
-            seg_marker = " [CONTAINS __SEG__ - PRESERVE EXACTLY]" if has_seg else ""
-            prompt_parts.append(f"ID: {unit['id']}{seg_marker}")
-            prompt_parts.append(f"TEXT: {unit['text']}")
-            prompt_parts.append("")
-
-        prompt_parts.append("Return JSON with all translations:")
+        logger.info("Submitting %d unique texts (%d units) to the Batch API...", len(lines), len(units))
+
+        batch_file = self.client.files.create(
+            file=("xlf_batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        job = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Batch job created: %s", job.id)
+
+        # Poll with exponential backoff until the job reaches a final state
+        delay = poll_interval
+        while job.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            job = self.client.batches.retrieve(job.id)
+
+            counts = getattr(job, 'request_counts', None)
+            progress = f" ({counts.completed}/{counts.total})" if counts else ""
+            logger.info("  Batch status: %s%s", job.status, progress)
+
+        translations = {}
+        errors = {}
+        if job.status == 'completed' and job.output_file_id:
+            output = self.client.files.content(job.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                item = _json_loads(line)
+                response = item.get('response') or {}
+                if response.get('status_code') == 200:
+                    body = response['body']
+                    usage = body.get('usage') or {}
+                    details = usage.get('prompt_tokens_details') or {}
+                    self.stats.record_usage(usage.get('prompt_tokens', 0) or 0,
+                                            details.get('cached_tokens', 0) or 0)
+                    choice = body['choices'][0]
+                    if choice.get('finish_reason') != 'stop':
+                        # Truncated or filtered output is never a translation
+                        errors[item['custom_id']] = (
+                            f"Batch output incomplete (finish_reason: {choice.get('finish_reason')})"
+                        )
+                    else:
+                        translations[item['custom_id']] = choice['message']['content'].strip()
+                else:
+                    errors[item['custom_id']] = str(item.get('error') or response.get('body'))
+
+        # Validate each distinct result once; failures go back through
+        # translate_unit (raised output cap, retries, validation)
+        retried = {}
+        for text, custom_id in custom_ids.items():
+            translated = translations.get(custom_id)
+            if translated is not None:
+                is_valid, error = self._validate_translation(
+                    original=text,
+                    translated=translated,
+                    has_seg_markers=seg_flags[custom_id]
+                )
+                if is_valid:
+                    self.stats.record(True)
+                    continue
+                error = f"Validation failed: {error}"
+            else:
+                error = errors.get(custom_id, f"Batch job {job.status}, no result returned")
+
+            logger.warning("⚠️  Batch result for unit %s unusable (%s), translating directly",
+                           custom_id, error)
+            retried[custom_id] = self.translate_unit(
+                text=text,
+                unit_id=custom_id,
+                target_language=target_language,
+                has_seg_markers=seg_flags[custom_id],
+                preserve_terms=preserve_terms,
+                custom_context=custom_context
+            )
+
+        # Fan the results back out to every unit (including duplicates)
+        results = []
+        for unit in units:
+            custom_id = custom_ids[unit['text']]
+            if custom_id in retried:
+                results.append(replace(retried[custom_id], unit_id=unit['id']))
+            else:
+                results.append(TranslationResult(
+                    success=True,
+                    translated_text=translations[custom_id],
+                    original_text=unit['text'],
+                    unit_id=unit['id']
+                ))
+
+        return results
+
+    def _build_batch_prompt(self, batch: List[Dict], seg_counts: List[int]) -> str:
+        """Build the per-batch user message (numbered JSON payload)"""
+        prompt_parts = []
+
+        # Units are keyed by their position in the batch ("1", "2", ...)
+        # which is far cheaper in tokens than the Storyline unit IDs
+        seg_keys = [str(idx) for idx, count in enumerate(seg_counts, start=1) if count]
+        if seg_keys:
+            prompt_parts.append(
+                f"Keys containing __SEG__ markers (PRESERVE EXACTLY): {', '.join(seg_keys)}"
+            )
+
+        prompt_parts.append(
+            json.dumps({str(idx): unit['text'] for idx, unit in enumerate(batch, start=1)},
+                       ensure_ascii=False, indent=0)
+        )
 
         return "\n".join(prompt_parts)
 
     def _parse_batch_response(self,
                              response_text: str,
-                             batch: List[Dict]) -> List[TranslationResult]:
-        """Parse JSON response from batch translation"""
-        import json
-
+                             batch: List[Dict],
+                             seg_counts: List[int]) -> List[TranslationResult]:
+        """Parse the numbered JSON response from batch translation"""
         try:
-            # Parse JSON
-            data = json.loads(response_text)
-            translations = data.get('translations', [])
-
-            # Create map for quick lookup
-            trans_map = {t['id']: t['text'] for t in translations if 'id' in t and 'text' in t}
+            # Parse JSON: {"1": "translated text", "2": ...}
+            trans_map = _json_loads(response_text)
+            if not isinstance(trans_map, dict):
+                raise ValueError("expected a JSON object")
 
             # Build results in original order
             results = []
-            for unit in batch:
+            for idx, (unit, original_count) in enumerate(zip(batch, seg_counts), start=1):
                 unit_id = unit['id']
+                translated = trans_map.get(str(idx))
 
-                if unit_id in trans_map:
-                    translated = trans_map[unit_id]
-
+                if isinstance(translated, str):
                     # Validate if has SEG markers
-                    if '__SEG__' in unit['text']:
-                        original_count = unit['text'].count('__SEG__')
+                    if original_count:
                         translated_count = translated.count('__SEG__')
 
                         if original_count != translated_count:
@@ -460,73 +1122,49 @@ class XLFTranslator:
         except Exception as e:
             raise ValueError(f"Failed to parse batch response: {e}")
     
-    def _build_prompt(self,
-                     text: str,
-                     target_language: str,
-                     has_seg_markers: bool,
-                     preserve_terms: Optional[List[str]],
-                     custom_context: Optional[str] = None) -> str:
-        """Build the translation prompt"""
-        
-        prompt_parts = [
-            f"Translate the following text from English (EN-UK) to {target_language}.",
-            ""
-        ]
-
-        # Add context (default + custom if provided)
-        context_lines = [
-            "CONTEXT:",
-            "This is training material for retail sales associates.",
-            "Use an informal, friendly tone throughout.",
-            "Ensure consistency in terminology and translations across all segments.",
-            "Adapt idioms naturally to the target language rather than translating literally.",
-            "Maintain consistent formality level (informal 'you' form where applicable)."
-        ]
-
-        if custom_context:
-            context_lines.append("")
-            context_lines.append(custom_context)
-
-        context_lines.append("")
-        prompt_parts.extend(context_lines)
-
-        prompt_parts.append("CRITICAL RULES:")
+    def _build_system_prompt(self,
+                             target_language: str,
+                             preserve_terms: Optional[List[str]],
+                             custom_context: Optional[str],
+                             batch: bool) -> str:
+        """
+        Build the system prompt shared by every request in a run
 
-        if has_seg_markers:
-            prompt_parts.extend([
-                "1. The text contains __SEG__ markers. These are STRUCTURAL MARKERS.",
-                "   - You MUST preserve EVERY __SEG__ marker EXACTLY as-is",
-                "   - Do NOT translate, modify, move, or remove __SEG__ markers",
-                "   - Keep __SEG__ in the EXACT SAME POSITIONS in the translation",
-                ""
-            ])
+        Everything that does not depend on the unit text lives here so the
+        prompt prefix is byte-identical across calls, which lets OpenAI's
+        automatic prompt caching reuse it. Only the trailing OUTPUT FORMAT
+        section differs between single-unit and batch requests.
+        """
+        return _system_prompt(
+            target_language,
+            tuple(sorted(preserve_terms or ())),
+            custom_context or '',
+            batch
+        )
 
-        if preserve_terms:
-            terms_str = ", ".join(f'"{term}"' for term in preserve_terms)
-            prompt_parts.extend([
-                f"2. Do NOT translate these brand/product names: {terms_str}",
-                "   - Keep them exactly as written in the source text",
-                ""
-            ])
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _prompt_cache_key(system_prompt: str) -> str:
+        """Stable routing key so requests sharing a prefix hit the same cache"""
+        return hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()[:32]
 
-        prompt_parts.extend([
-            "3. PRESERVE ALL WHITESPACE:",
-            "   - If source text ends with a space, translation MUST end with a space",
-            "   - If source text starts with a space, translation MUST start with a space",
-            "   - Preserve line breaks (\\n, \\r\\n) exactly",
-            "   - This is CRITICAL for proper text rendering in Storyline",
-            "   - Text segments in Storyline don't auto-space, so missing spaces cause words to run together",
-            "",
-            "4. OUTPUT FORMAT:",
-            "   - Provide ONLY the translated text",
-            "   - No explanations, no notes, no markdown formatting",
-            "   - Just the pure translation",
-            "",
-            "TEXT TO TRANSLATE:",
-            text
-        ])
-        
-        return "\n".join(prompt_parts)
+    def _sync_rate_limits(self, headers):
+        """Feed the x-ratelimit-remaining-* response headers to the limiter"""
+        def read(name: str) -> Optional[int]:
+            try:
+                return int(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        self.rate_limiter.sync(read('x-ratelimit-remaining-requests'),
+                               read('x-ratelimit-remaining-tokens'))
+
+    def _record_usage(self, response):
+        """Accumulate prompt-cache usage reported by the API"""
+        usage = getattr(response, 'usage', None)
+        details = getattr(usage, 'prompt_tokens_details', None)
+        self.stats.record_usage(getattr(usage, 'prompt_tokens', 0) or 0,
+                                getattr(details, 'cached_tokens', 0) or 0)
     
     def _validate_translation(self,
                             original: str,
@@ -553,32 +1191,35 @@ class XLFTranslator:
                     # GPT-4 added extra markers - log warning but don't fail
                     # The writer will handle cleanup
                     extra = translated_count - original_count
-                    print(f"      ⚠️  GPT-4 added {extra} extra __SEG__ marker(s) ({original_count} → {translated_count})")
-                    print(f"      → Writer will clean up extra markers")
+                    logger.warning("⚠️  GPT-4 added %d extra __SEG__ marker(s) (%d → %d); writer will clean them up",
+                                   extra, original_count, translated_count)
                     # Don't fail validation - let writer handle it
                 elif translated_count < original_count:
                     # GPT-4 removed markers - this is critical
                     return False, f"__SEG__ markers lost: expected {original_count}, got {translated_count}"
 
         # Check for common API errors
-        if "I cannot" in translated or "I apologize" in translated:
-            return False, "Translation contains refusal language"
+        if _REFUSAL_RE.match(translated) and not _REFUSAL_RE.match(original):
+            return False, REFUSAL_ERROR
 
         return True, ""
     
     def get_statistics(self) -> Dict:
         """Get translation statistics"""
+        stats = self.stats.as_dict()
         return {
-            **self.stats,
-            'success_rate': round(self.stats['successful'] / self.stats['total_translations'] * 100, 2) 
-                           if self.stats['total_translations'] > 0 else 0
+            **stats,
+            'success_rate': round(stats['successful'] / stats['total_translations'] * 100, 2) 
+                           if stats['total_translations'] > 0 else 0,
+            'cache_hit_rate': round(stats['cached_tokens'] / stats['prompt_tokens'] * 100, 2)
+                              if stats['prompt_tokens'] > 0 else 0
         }
 
 
 def main():
     """Example usage"""
-    import sys
-    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Check for API key
     if not os.getenv('OPENAI_API_KEY'):
         print("Error: OPENAI_API_KEY environment variable not set")
@@ -10,14 +10,35 @@ Handles writing translated content back to XLF files while preserving:
 Works in conjunction with XLFParser to maintain file integrity.
 """
 
+import re
+import logging
+from copy import deepcopy
 from lxml import etree
 from typing import Optional
-from .parser import XLFParser, TransUnit
+from .parser import XLFParser, TransUnit, _NS, _TAG_TU, _TAG_SOURCE, _TAG_G, _ATTR_XML_SPACE
+
+
+logger = logging.getLogger(__name__)
+
+_TAG_TARGET = f'{{{_NS}}}target'
+
+
+# Whitespace copied from source segment edges onto the translation
+_PADDING_WS = ' \t\n\r'
+
+# A __SEG__ marker plus the single spaces of the parser's ' __SEG__ ' separator
+_SEG_SPLIT_RE = re.compile(r' ?__SEG__ ?')
+
+# A leftover __SEG__ marker with all whitespace around it (final cleanup)
+_SEG_STRIP_RE = re.compile(r'\s*__SEG__\s*')
 
 
 class XLFWriter:
     """Writes translated content back to XLF format"""
 
+    # Compiled once; evaluated in C on every unit
+    _G_TEXT_XPATH = etree.XPath('.//xliff:g[@ctype="x-text"]', namespaces=XLFParser.NS)
+
     def __init__(self, parser: XLFParser):
         """
         Initialize writer with a parsed XLF file
@@ -44,14 +65,12 @@ class XLFWriter:
         trans_unit_elem = source_elem.getparent()
 
         # Check if target element exists
-        target_elem = trans_unit_elem.find('xliff:target', self.NS)
+        target_elem = trans_unit_elem.find(_TAG_TARGET)
 
         if target_elem is None:
-            # Create new target element
-            target_elem = etree.Element('{%s}target' % self.NS['xliff'])
-            # Insert after source
-            source_index = list(trans_unit_elem).index(source_elem)
-            trans_unit_elem.insert(source_index + 1, target_elem)
+            # Create new target element right after source
+            target_elem = etree.Element(_TAG_TARGET)
+            source_elem.addnext(target_elem)
 
         # Update based on unit type
         if unit.datatype == 'plaintext':
@@ -72,12 +91,12 @@ class XLFWriter:
             translated_text: Translated text
             unit: Original TransUnit
         """
-        # Clear existing content
-        target_elem.clear()
+        # Clear existing content (the tail belongs to the surrounding layout)
+        target_elem.clear(keep_tail=True)
 
         # Copy attributes from source if needed
         if unit.xml_space_preserve:
-            target_elem.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+            target_elem.set(_ATTR_XML_SPACE, 'preserve')
 
         # Set the text
         target_elem.text = translated_text
@@ -96,91 +115,65 @@ class XLFWriter:
         - Whitespace preservation from source
 
         Args:
-            target_elem: The <target> element to write to
+            target_elem: The <target> element to replace
             translated_text: Translated text (may contain __SEG__ markers)
             unit: Original TransUnit with g_segments info
         """
-        # Clear existing content
-        target_elem.clear()
+        # Copy the entire structure from source in one C-level subtree copy,
+        # retag it as <target> and swap it in for the old target element
+        source_elem = unit.source_element
+        new_target = deepcopy(source_elem)
+        new_target.tag = _TAG_TARGET
+        new_target.attrib.clear()
+        new_target.tail = source_elem.tail
 
         # Copy xml:space attribute if needed
         if unit.xml_space_preserve:
-            target_elem.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
-
-        # Copy the entire structure from source
-        source_elem = unit.source_element
+            new_target.set(_ATTR_XML_SPACE, 'preserve')
 
-        # Deep copy all children from source to target
-        for child in source_elem:
-            target_elem.append(self._deep_copy_element(child))
-
-        # Copy text and tail
-        target_elem.text = source_elem.text
-        target_elem.tail = source_elem.tail
+        target_elem.getparent().replace(target_elem, new_target)
+        target_elem = new_target
 
         # Now update the translatable content in <g> tags
         if unit.g_segments:
-            # Get source g tags to know how many segments we SHOULD have
-            source_g_tags = source_elem.findall('.//xliff:g[@ctype="x-text"]', self.NS)
-            expected_segments = len(source_g_tags)
+            # The parsed segments tell us how many we SHOULD have
+            expected_segments = len(unit.g_segments)
 
             # ROBUST SPLITTING LOGIC
-            # Step 1: Split by __SEG__ (with or without spaces)
-            # Handle both ' __SEG__ ' and '__SEG__'
-            raw_segments = translated_text.split(' __SEG__ ')
-            if len(raw_segments) == 1:
-                # Try without spaces
-                raw_segments = translated_text.split('__SEG__')
-
-            # Step 2: Clean each segment
-            # - Remove any remaining __SEG__ markers (in case they're in the middle)
-            # - DO NOT strip whitespace yet - we'll preserve it from source later
-            cleaned_segments = []
-            for seg in raw_segments:
-                # Remove __SEG__ markers but preserve whitespace for now
-                cleaned = seg.replace('__SEG__', '')
-                # Only filter out completely empty segments
-                if cleaned or cleaned == '':  # Keep even whitespace-only segments
-                    cleaned_segments.append(cleaned)
-
-            # Remove truly empty segments (but keep whitespace-only ones)
-            cleaned_segments = [s for s in cleaned_segments if s is not None]
+            # Step 1-2: Split on every __SEG__ (with or without the separator
+            # spaces) in one pass. Other whitespace is kept for now - we'll
+            # preserve it from source later
+            cleaned_segments = _SEG_SPLIT_RE.split(translated_text)
 
             # Step 3: Handle segment count mismatch
             if len(cleaned_segments) != expected_segments:
-                print(f"      ⚠️  Unit {unit.id}: Segment count mismatch")
-                print(f"         Expected: {expected_segments} (from source <g> tags)")
-                print(f"         Got: {len(cleaned_segments)} (after splitting/cleaning)")
-                print(f"         Raw split gave: {len(raw_segments)} segments")
+                logger.warning("      ⚠️  Unit %s: Segment count mismatch\n"
+                               "         Expected: %d (from source <g> tags)\n"
+                               "         Got: %d (after splitting)",
+                               unit.id, expected_segments, len(cleaned_segments))
 
                 # STRATEGY: Try to match segments intelligently
                 if len(cleaned_segments) < expected_segments:
-                    # Too few segments - pad with empty strings
-                    while len(cleaned_segments) < expected_segments:
-                        cleaned_segments.append('')
-                    print(f"         → Padded to {expected_segments} segments")
+                    # Too few segments - pad with empty strings in one step
+                    cleaned_segments += [''] * (expected_segments - len(cleaned_segments))
+                    logger.warning("         → Padded to %d segments", expected_segments)
 
-                elif len(cleaned_segments) > expected_segments:
+                else:
                     # Too many segments - need to merge some
-                    print(f"         → Merging extra segments")
+                    logger.warning("         → Merging extra segments")
 
                     # Simple strategy: merge extra segments into the last one
-                    merged_segments = cleaned_segments[:expected_segments-1]
-                    merged_segments.append(' '.join(cleaned_segments[expected_segments-1:]))
-                    cleaned_segments = merged_segments
+                    cleaned_segments[expected_segments-1:] = [' '.join(cleaned_segments[expected_segments-1:])]
 
-                    print(f"         → Result: {len(cleaned_segments)} segments")
+                    logger.warning("         → Result: %d segments", len(cleaned_segments))
 
             # Step 4: Update <g> tag text content with whitespace preservation
-            target_g_tags = target_elem.findall('.//xliff:g[@ctype="x-text"]', self.NS)
-
-            for source_g, target_g, segment_text in zip(source_g_tags, target_g_tags, cleaned_segments):
-                # Remove any remaining __SEG__ markers
-                segment_text = segment_text.replace('__SEG__', '')
+            target_g_tags = self._G_TEXT_XPATH(target_elem)
 
+            for source_seg, target_g, segment_text in zip(unit.g_segments, target_g_tags, cleaned_segments):
                 # CRITICAL: Preserve whitespace patterns from source
                 final_text = self._preserve_whitespace(
-                    source_text=source_g.text or '',
+                    source_text=source_seg.original_text,
                     target_text=segment_text
                 )
 
@@ -189,33 +182,6 @@ class XLFWriter:
             # No g_segments, just copy structure
             pass
 
-    def _deep_copy_element(self, elem: etree._Element) -> etree._Element:
-        """
-        Deep copy an XML element with all attributes and children
-
-        Args:
-            elem: Element to copy
-
-        Returns:
-            Copied element
-        """
-        # Create new element with same tag
-        new_elem = etree.Element(elem.tag)
-
-        # Copy attributes
-        for key, value in elem.attrib.items():
-            new_elem.set(key, value)
-
-        # Copy text and tail
-        new_elem.text = elem.text
-        new_elem.tail = elem.tail
-
-        # Recursively copy children
-        for child in elem:
-            new_elem.append(self._deep_copy_element(child))
-
-        return new_elem
-
     def _preserve_whitespace(self, source_text: str, target_text: str) -> str:
         """
         Preserve leading and trailing whitespace from source in target text
@@ -243,78 +209,65 @@ class XLFWriter:
         # Strip target to get clean translated text
         clean_target = target_text.strip()
 
-        # Analyze source whitespace pattern
-        leading_ws = ''
-        trailing_ws = ''
-
-        # Extract leading whitespace
-        for char in source_text:
-            if char in (' ', '\t', '\n', '\r'):
-                leading_ws += char
-            else:
-                break
+        # Analyze source whitespace pattern (explicit set: a non-breaking
+        # space in the source is content, not padding)
+        leading_len = len(source_text) - len(source_text.lstrip(_PADDING_WS))
+        trailing_len = len(source_text) - len(source_text.rstrip(_PADDING_WS))
 
-        # Extract trailing whitespace
-        for char in reversed(source_text):
-            if char in (' ', '\t', '\n', '\r'):
-                trailing_ws = char + trailing_ws
-            else:
-                break
+        leading_ws = source_text[:leading_len]
+        trailing_ws = source_text[len(source_text) - trailing_len:]
 
         # Apply whitespace pattern to target
         result = leading_ws + clean_target + trailing_ws
 
         return result
 
-    def _final_cleanup(self, output_path: str) -> int:
+    def _cleanup_tree(self) -> int:
         """
         Final safety pass: Remove ANY remaining __SEG__ markers
 
         This is the SAFETY NET that catches anything the writer missed.
-
-        Args:
-            output_path: Path to the output XLF file
+        Runs on the in-memory tree so the file is only written once.
 
         Returns:
             Number of markers removed
         """
-        tree = etree.parse(output_path)
         removed_count = 0
-
-        for unit in tree.findall('.//xliff:trans-unit', self.NS):
-            target = unit.find('xliff:target', self.NS)
-
+        for trans_unit in self.root.iter(_TAG_TU):
+            # Only the unit's own target; <alt-trans> targets are left alone
+            target = trans_unit.find(_TAG_TARGET)
             if target is None:
                 continue
 
             # Check every <g> tag
-            g_tags = target.findall('.//xliff:g[@ctype="x-text"]', self.NS)
-
-            for g_tag in g_tags:
-                if g_tag.text and '__SEG__' in g_tag.text:
+            for g_tag in target.iter(_TAG_G):
+                if g_tag.get('ctype') == 'x-text' and g_tag.text and '__SEG__' in g_tag.text:
                     original = g_tag.text
-                    cleaned = g_tag.text.replace('__SEG__', '').strip()
+                    cleaned = _SEG_STRIP_RE.sub(' ', original).strip()
                     g_tag.text = cleaned
                     removed_count += 1
 
-                    print(f"      🧹 Cleaned {unit.get('id')}, <g id='{g_tag.get('id')}'>:")
-                    print(f"         Before: '{original[:50]}...'")
-                    print(f"         After:  '{cleaned[:50]}...'")
-
-        if removed_count > 0:
-            # Save the cleaned file
-            tree.write(output_path, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                    logger.warning("      🧹 Cleaned %s, <g id='%s'>:\n"
+                                   "         Before: '%s...'\n"
+                                   "         After:  '%s...'",
+                                   trans_unit.get('id'), g_tag.get('id'),
+                                   original[:50], cleaned[:50])
 
         return removed_count
 
-    def save(self, output_path: str, pretty_print: bool = True):
+    def save(self, output_path: str, pretty_print: bool = False):
         """
         Save the modified XLF file
 
         Args:
             output_path: Path to save the file to
-            pretty_print: Whether to format with indentation
+            pretty_print: Whether to re-indent the output (off by default:
+                          keeps the layout of the source file)
         """
+        # Run final cleanup pass before the single write
+        logger.info("\n🧹 Running final cleanup pass...")
+        removed = self._cleanup_tree()
+
         # Write to file
         self.tree.write(
             output_path,
@@ -323,15 +276,11 @@ class XLFWriter:
             pretty_print=pretty_print
         )
 
-        # Run final cleanup pass
-        print(f"\n🧹 Running final cleanup pass...")
-        removed = self._final_cleanup(output_path)
-
         if removed > 0:
-            print(f"⚠️  Final cleanup removed {removed} remaining __SEG__ marker(s)")
-            print(f"✅ File has been cleaned and re-saved")
+            logger.warning("⚠️  Final cleanup removed %d remaining __SEG__ marker(s)\n"
+                           "✅ File has been cleaned and saved", removed)
         else:
-            print(f"✅ No cleanup needed - file is clean")
+            logger.info("✅ No cleanup needed - file is clean")
 
     def get_statistics(self):
         """Get statistics about modifications"""
@@ -351,10 +300,21 @@ class XLFWriter:
         Returns:
             Dict with validation results and issues found
         """
-        from lxml import etree
+        return self.validate_tree(etree.parse(output_path))
+
+    def validate_tree(self, tree: Optional[etree._ElementTree] = None) -> dict:
+        """
+        Validate an XLF tree for common issues without re-reading it from disk
 
-        tree = etree.parse(output_path)
-        NS = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
+        Args:
+            tree: Parsed XLF tree (default: this writer's in-memory tree,
+                  i.e. exactly what save() wrote)
+
+        Returns:
+            Dict with validation results and issues found
+        """
+        if tree is None:
+            tree = self.tree
 
         issues = {
             'seg_markers': [],      # CRITICAL: Should be empty!
@@ -363,11 +323,11 @@ class XLFWriter:
             'missing_targets': []
         }
 
-        # Check all trans-units
-        for unit in tree.findall('.//xliff:trans-unit', NS):
+        # Check all trans-units (streamed, no intermediate list)
+        for unit in tree.iter(_TAG_TU):
             unit_id = unit.get('id')
-            source = unit.find('xliff:source', NS)
-            target = unit.find('xliff:target', NS)
+            source = unit.find(_TAG_SOURCE)
+            target = unit.find(_TAG_TARGET)
 
             # Check for missing target
             if target is None:
@@ -375,28 +335,27 @@ class XLFWriter:
                 continue
 
             # CRITICAL CHECK: Look for __SEG__ markers in individual <g> tags
-            g_tags = target.findall('.//xliff:g[@ctype="x-text"]', NS)
-
-            for g_tag in g_tags:
-                if g_tag.text and '__SEG__' in g_tag.text:
+            target_g_count = 0
+            for g_tag in target.iter(_TAG_G):
+                if g_tag.get('ctype') != 'x-text':
+                    continue
+                target_g_count += 1
+                text = g_tag.text
+                if text and '__SEG__' in text:
                     issues['seg_markers'].append({
                         'unit_id': unit_id,
                         'g_id': g_tag.get('id'),
-                        'text': g_tag.text,
-                        'marker_count': g_tag.text.count('__SEG__')
+                        'text': text,
+                        'marker_count': text.count('__SEG__')
                     })
 
-            # Get all text from target for empty check
-            target_text = ''.join(target.itertext())
-
-            # Check for empty targets
-            if not target_text.strip():
+            # Check for empty targets (stops at the first non-blank text)
+            if not any(text.strip() for text in target.itertext()):
                 issues['empty_targets'].append(unit_id)
 
             # Check tag structure matches source
             if source is not None:
-                source_g_count = len(source.findall('.//xliff:g[@ctype="x-text"]', NS))
-                target_g_count = len(target.findall('.//xliff:g[@ctype="x-text"]', NS))
+                source_g_count = len(self._G_TEXT_XPATH(source))
 
                 if source_g_count != target_g_count and source_g_count > 0:
                     issues['tag_mismatches'].append({
@@ -428,6 +387,8 @@ def main():
     import sys
     from parser import XLFParser
 
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     if len(sys.argv) < 2:
         print("Usage: python writer.py <xlf_file>")
         sys.exit(1)
@@ -10,10 +10,45 @@ This tests the three-layer defense:
 
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+from copy import deepcopy
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from lxml import etree
 
+# Use the writer's own patterns so this script checks what it actually does
+from src.writer import _SEG_SPLIT_RE, _SEG_STRIP_RE
+
+# Target <g> text tags that still contain a marker, matched inside libxml2
+NS = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
+_DIRTY_XPATH = etree.XPath(
+    './/xliff:target//xliff:g[@ctype="x-text"][contains(text(), "__SEG__")]',
+    namespaces=NS
+)
+_COUNT_DIRTY = etree.XPath(
+    'count(.//xliff:target//xliff:g[@ctype="x-text"][contains(text(), "__SEG__")])',
+    namespaces=NS
+)
+
+# A simple test XLF with __SEG__ markers, parsed once at import
+TEST_XLF = """<?xml version="1.0" encoding="utf-8"?>
+<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
+  <file source-language="en-GB" datatype="x-storyline360">
+    <body>
+      <trans-unit id="test1" datatype="x-DocumentState">
+        <source>
+          <g id="1" ctype="x-text">Source text 1</g>
+          <g id="2" ctype="x-text">Source text 2</g>
+        </source>
+        <target>
+          <g id="1" ctype="x-text">Translated __SEG__ text 1</g>
+          <g id="2" ctype="x-text">Translated text 2</g>
+        </target>
+      </trans-unit>
+    </body>
+  </file>
+</xliff>"""
+_TEMPLATE = etree.fromstring(TEST_XLF.encode('utf-8'))
+
 
 def test_segment_cleaning():
     """Test the segment cleaning logic"""
@@ -69,33 +104,26 @@ def test_segment_cleaning():
         translated_text = test['input']
         expected_segments = test['expected_segments']
 
-        # Step 1: Split
-        raw_segments = translated_text.split(' __SEG__ ')
-        if len(raw_segments) == 1:
-            raw_segments = translated_text.split('__SEG__')
-
-        # Step 2: Clean
-        cleaned_segments = []
-        for seg in raw_segments:
-            cleaned = seg.strip()
-            cleaned = cleaned.replace('__SEG__', '').strip()
-            if cleaned:
-                cleaned_segments.append(cleaned)
-
-        print(f"Raw split: {len(raw_segments)} segments")
-        print(f"After cleaning: {len(cleaned_segments)} segments")
+        # Step 1: Split exactly as the writer does (empty segments are kept
+        # so later text stays on its own <g> tag)
+        cleaned_segments = _SEG_SPLIT_RE.split(translated_text)
+
+        got = len(cleaned_segments)
+        delta = got - expected_segments
+        print(f"After splitting: {got} segments")
         print(f"Expected: {expected_segments} segments")
 
-        # Step 3: Handle mismatches
-        if len(cleaned_segments) > expected_segments:
-            print(f"→ Merging {len(cleaned_segments) - expected_segments} extra segments")
-            merged_segments = cleaned_segments[:expected_segments-1]
-            merged_segments.append(' '.join(cleaned_segments[expected_segments-1:]))
-            cleaned_segments = merged_segments
-        elif len(cleaned_segments) < expected_segments:
-            print(f"→ Padding with {expected_segments - len(cleaned_segments)} empty segments")
-            while len(cleaned_segments) < expected_segments:
-                cleaned_segments.append('')
+        # Step 2: Handle mismatches
+        if delta > 0:
+            print(f"→ Merging {delta} extra segments")
+            cleaned_segments[expected_segments-1:] = [' '.join(cleaned_segments[expected_segments-1:])]
+        elif delta < 0:
+            print(f"→ Padding with {-delta} empty segments")
+            cleaned_segments.extend([''] * -delta)
+
+        # Step 3: _preserve_whitespace trims each segment before reapplying
+        # the source's leading/trailing whitespace
+        cleaned_segments = [seg.strip() for seg in cleaned_segments]
 
         print(f"Final segments: {cleaned_segments}")
 
@@ -113,73 +141,27 @@ def test_final_cleanup():
     print("Testing Final Cleanup Safety Net")
     print("=" * 70)
 
-    # Create a simple test XLF with __SEG__ markers
-    test_xlf = """<?xml version="1.0" encoding="utf-8"?>
-<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
-  <file source-language="en-GB" datatype="x-storyline360">
-    <body>
-      <trans-unit id="test1" datatype="x-DocumentState">
-        <source>
-          <g id="1" ctype="x-text">Source text 1</g>
-          <g id="2" ctype="x-text">Source text 2</g>
-        </source>
-        <target>
-          <g id="1" ctype="x-text">Translated __SEG__ text 1</g>
-          <g id="2" ctype="x-text">Translated text 2</g>
-        </target>
-      </trans-unit>
-    </body>
-  </file>
-</xliff>"""
+    # Work on a fresh copy of the parsed template and check for markers before cleanup
+    tree = deepcopy(_TEMPLATE).getroottree()
 
-    # Write test file
-    test_file = '/tmp/test_seg_cleanup.xlf'
-    with open(test_file, 'w', encoding='utf-8') as f:
-        f.write(test_xlf)
-
-    print(f"Created test file: {test_file}")
-
-    # Parse and check for markers before cleanup
-    NS = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
-    tree = etree.parse(test_file)
-
-    markers_before = 0
-    for unit in tree.findall('.//xliff:trans-unit', NS):
-        target = unit.find('xliff:target', NS)
-        if target:
-            g_tags = target.findall('.//xliff:g[@ctype="x-text"]', NS)
-            for g_tag in g_tags:
-                if g_tag.text and '__SEG__' in g_tag.text:
-                    markers_before += 1
-                    print(f"Found marker in: '{g_tag.text}'")
+    dirty = _DIRTY_XPATH(tree)
+    markers_before = len(dirty)
+    for g_tag in dirty:
+        print(f"Found marker in: '{g_tag.text}'")
 
     print(f"\n__SEG__ markers before cleanup: {markers_before}")
 
-    # Simulate the _final_cleanup function
+    # Simulate the final cleanup pass
     removed_count = 0
-    for unit in tree.findall('.//xliff:trans-unit', NS):
-        target = unit.find('xliff:target', NS)
-        if target is None:
-            continue
-
-        g_tags = target.findall('.//xliff:g[@ctype="x-text"]', NS)
-        for g_tag in g_tags:
-            if g_tag.text and '__SEG__' in g_tag.text:
-                original = g_tag.text
-                cleaned = g_tag.text.replace('__SEG__', '').strip()
-                g_tag.text = cleaned
-                removed_count += 1
-                print(f"Cleaned: '{original}' → '{cleaned}'")
+    for g_tag in dirty:
+        original = g_tag.text
+        cleaned = _SEG_STRIP_RE.sub(' ', g_tag.text).strip()
+        g_tag.text = cleaned
+        removed_count += 1
+        print(f"Cleaned: '{original}' → '{cleaned}'")
 
     # Check after cleanup
-    markers_after = 0
-    for unit in tree.findall('.//xliff:trans-unit', NS):
-        target = unit.find('xliff:target', NS)
-        if target:
-            g_tags = target.findall('.//xliff:g[@ctype="x-text"]', NS)
-            for g_tag in g_tags:
-                if g_tag.text and '__SEG__' in g_tag.text:
-                    markers_after += 1
+    markers_after = int(_COUNT_DIRTY(tree))
 
     print(f"\n__SEG__ markers after cleanup: {markers_after}")
     print(f"Removed: {removed_count}")
@@ -189,9 +171,6 @@ def test_final_cleanup():
     else:
         print("❌ FAIL: Some markers remain!")
 
-    # Cleanup
-    os.remove(test_file)
-
 
 if __name__ == '__main__':
     test_segment_cleaning()
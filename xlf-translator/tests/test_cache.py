@@ -0,0 +1,99 @@
+"""
+Tests for TranslationCache
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cache import TranslationCache, get_cache_mode, CACHE_TTL_SECONDS
+
+
+def _key(text):
+    return TranslationCache.make_key('gpt-5.1', 'de', ['Pixel'], None, text)
+
+
+def test_hit_and_miss(tmp_path):
+    cache = TranslationCache(mode='on', path=tmp_path / 'cache.sqlite')
+    cache.put_many([(_key('Hello'), 'Hallo')])
+
+    assert cache.get(_key('Hello')) == 'Hallo'
+    assert cache.get(_key('Goodbye')) is None
+    assert cache.hits == 1
+
+
+def test_key_covers_translation_settings():
+    base = TranslationCache.make_key('gpt-5.1', 'de', ['A', 'B'], 'ctx', 'Hello')
+
+    assert base == TranslationCache.make_key('gpt-5.1', 'de', ['B', 'A'], 'ctx', 'Hello')
+    assert base != TranslationCache.make_key('gpt-5.1', 'fr', ['A', 'B'], 'ctx', 'Hello')
+    assert base != TranslationCache.make_key('gpt-5.1', 'de', ['A'], 'ctx', 'Hello')
+    assert base != TranslationCache.make_key('gpt-5.1', 'de', ['A', 'B'], None, 'Hello')
+
+
+def test_expired_entries_are_ignored(tmp_path, monkeypatch):
+    cache = TranslationCache(mode='on', path=tmp_path / 'cache.sqlite')
+    cache.put_many([(_key('Hello'), 'Hallo')])
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + CACHE_TTL_SECONDS + 60)
+
+    assert cache.get(_key('Hello')) is None
+    assert cache.hits == 0
+
+
+def test_off_mode_bypasses_cache(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    TranslationCache(mode='on', path=path).put_many([(_key('Hello'), 'Hallo')])
+
+    cache = TranslationCache(mode='off', path=path)
+    cache.put_many([(_key('Bye'), 'Tschüss')])
+
+    assert not cache.enabled
+    assert cache.get(_key('Hello')) is None
+    assert TranslationCache(mode='on', path=path).get(_key('Bye')) is None
+
+
+def test_refresh_mode_writes_but_does_not_read(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    TranslationCache(mode='on', path=path).put_many([(_key('Hello'), 'Hallo')])
+
+    cache = TranslationCache(mode='refresh', path=path)
+    assert cache.get(_key('Hello')) is None
+
+    cache.put_many([(_key('Hello'), 'Guten Tag')])
+    assert TranslationCache(mode='on', path=path).get(_key('Hello')) == 'Guten Tag'
+
+
+def test_delete_mode_starts_from_empty_cache(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    TranslationCache(mode='on', path=path).put_many([(_key('Hello'), 'Hallo')])
+
+    cache = TranslationCache(mode='delete', path=path)
+
+    assert cache.mode == 'on'
+    assert cache.get(_key('Hello')) is None
+    cache.put_many([(_key('Hello'), 'Servus')])
+    assert cache.get(_key('Hello')) == 'Servus'
+
+
+def test_each_path_has_its_own_database(tmp_path):
+    first = TranslationCache(mode='on', path=tmp_path / 'first.sqlite')
+    second = TranslationCache(mode='on', path=tmp_path / 'second.sqlite')
+
+    first.put_many([(_key('Hello'), 'Hallo')])
+
+    assert second.get(_key('Hello')) is None
+    assert (tmp_path / 'second.sqlite').exists()
+
+
+def test_mode_from_environment(monkeypatch):
+    monkeypatch.setenv('XLF_CACHE', ' Refresh ')
+    assert get_cache_mode() == 'refresh'
+
+    monkeypatch.setenv('XLF_CACHE', 'sometimes')
+    assert get_cache_mode() == 'on'
+
+    monkeypatch.delenv('XLF_CACHE')
+    assert get_cache_mode() == 'on'
@@ -0,0 +1,180 @@
+"""
+Tests for the translation daemon (BatchBuffer and the socket protocol)
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from src.daemon import (
+    BatchBuffer, serve, translate_via_daemon,
+    BATCH_WINDOW_SECONDS, MAX_REQUESTS_PER_WINDOW, MAX_TOKENS_PER_WINDOW
+)
+from src.translator import TranslationResult
+
+
+class FakeTranslator:
+    """Upper-cases every unit and records each translate_batch call"""
+
+    def __init__(self):
+        self.calls = []
+
+    @staticmethod
+    def _estimate_tokens(text):
+        return len(text)
+
+    def warm_up(self):
+        pass
+
+    def translate_batch(self, units, target_language, preserve_terms=None, custom_context=None):
+        self.calls.append(units)
+        return [
+            TranslationResult(success=True, translated_text=u['text'].upper(),
+                              original_text=u['text'], unit_id=u['id'])
+            for u in units
+        ]
+
+
+def _request(*texts, target_language='de'):
+    return {
+        'units': [{'text': t, 'id': f'u{i}', 'has_seg_markers': False} for i, t in enumerate(texts)],
+        'target_language': target_language,
+        'preserve_terms': None,
+        'custom_context': None
+    }
+
+
+def test_flushes_after_window():
+    async def scenario():
+        translator = FakeTranslator()
+        buffer = BatchBuffer(translator)
+
+        start = time.monotonic()
+        results = await asyncio.gather(
+            buffer.submit(_request('one')),
+            buffer.submit(_request('two'))
+        )
+        return translator, results, time.monotonic() - start
+
+    translator, results, elapsed = asyncio.run(scenario())
+
+    # Both requests waited for the window and shared one call
+    assert elapsed >= BATCH_WINDOW_SECONDS * 0.9
+    assert len(translator.calls) == 1
+    assert [[r.translated_text for r in rs] for rs in results] == [['ONE'], ['TWO']]
+    assert [r.unit_id for r in results[0]] == ['u0']
+
+
+def test_flushes_at_max_requests():
+    async def scenario():
+        translator = FakeTranslator()
+        buffer = BatchBuffer(translator)
+
+        tasks = [asyncio.ensure_future(buffer.submit(_request(f'text {n}')))
+                 for n in range(MAX_REQUESTS_PER_WINDOW - 1)]
+        await asyncio.sleep(0)
+        waiting = buffer._timer is not None and len(buffer._pending) == MAX_REQUESTS_PER_WINDOW - 1
+
+        tasks.append(asyncio.ensure_future(buffer.submit(_request('last'))))
+        await asyncio.sleep(0)
+        flushed = buffer._timer is None and not buffer._pending
+
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=BATCH_WINDOW_SECONDS / 2)
+        return translator, waiting, flushed
+
+    translator, waiting, flushed = asyncio.run(scenario())
+
+    assert waiting
+    assert flushed
+    assert len(translator.calls) == 1
+    assert len(translator.calls[0]) == MAX_REQUESTS_PER_WINDOW
+
+
+def test_flushes_at_max_tokens():
+    async def scenario():
+        translator = FakeTranslator()
+        buffer = BatchBuffer(translator)
+
+        small = asyncio.ensure_future(buffer.submit(_request('x' * (MAX_TOKENS_PER_WINDOW - 2))))
+        await asyncio.sleep(0)
+        waiting = buffer._timer is not None
+
+        large = asyncio.ensure_future(buffer.submit(_request('yy')))
+        await asyncio.wait_for(asyncio.gather(small, large), timeout=BATCH_WINDOW_SECONDS / 2)
+        return translator, waiting
+
+    translator, waiting = asyncio.run(scenario())
+
+    assert waiting
+    assert len(translator.calls) == 1
+
+
+def test_groups_requests_by_prompt_settings():
+    async def scenario():
+        translator = FakeTranslator()
+        buffer = BatchBuffer(translator, window=0.01)
+        results = await asyncio.gather(
+            buffer.submit(_request('a', target_language='de')),
+            buffer.submit(_request('b', target_language='fr'))
+        )
+        return translator, results
+
+    translator, results = asyncio.run(scenario())
+
+    assert len(translator.calls) == 2
+    assert [rs[0].translated_text for rs in results] == ['A', 'B']
+
+
+def test_client_server_round_trip(tmp_path):
+    socket_path = str(tmp_path / 'daemon.sock')
+    translator = FakeTranslator()
+
+    async def scenario():
+        server = asyncio.ensure_future(serve(socket_path, translator=translator))
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+
+        try:
+            return await asyncio.wait_for(asyncio.gather(
+                asyncio.to_thread(translate_via_daemon, _request('hello', 'world')['units'], 'de',
+                                  socket_path=socket_path),
+                asyncio.to_thread(translate_via_daemon, _request('again')['units'], 'de',
+                                  socket_path=socket_path)
+            ), timeout=5)
+        finally:
+            server.cancel()
+
+    first, second = asyncio.run(scenario())
+
+    assert [(r.unit_id, r.translated_text, r.success) for r in first] == [
+        ('u0', 'HELLO', True), ('u1', 'WORLD', True)
+    ]
+    assert [(r.unit_id, r.translated_text) for r in second] == [('u0', 'AGAIN')]
+
+
+def test_client_rejects_malformed_reply(tmp_path):
+    socket_path = str(tmp_path / 'broken.sock')
+
+    async def handle(reader, writer):
+        await reader.read()
+        writer.write(json.dumps([{'success': True}])[:-3].encode('utf-8'))
+        await writer.drain()
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+        async with server:
+            return await asyncio.wait_for(
+                asyncio.to_thread(translate_via_daemon, _request('hello')['units'], 'de',
+                                  socket_path=socket_path),
+                timeout=5
+            )
+
+    # main.py falls back to direct translation on ValueError
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
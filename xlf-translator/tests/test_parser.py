@@ -0,0 +1,101 @@
+"""
+Tests for XLFParser
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import XLFParser
+
+
+SAMPLE_XLF = '''<?xml version="1.0" encoding="utf-8"?>
+<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
+  <file source-language="en" target-language="de" datatype="plaintext">
+    <body>
+      <trans-unit id="p1" datatype="plaintext"><source>  Scene 1  </source></trans-unit>
+      <trans-unit id="p2" datatype="plaintext" xml:space="preserve"><source> Next </source></trans-unit>
+      <trans-unit id="s1" datatype="x-DocumentState" xml:space="preserve"><source><g id="1" ctype="x-text">Hello </g><bpt id="2"/><g id="3" ctype="x-text">world</g><ept id="2"/></source></trans-unit>
+      <trans-unit id="s2" datatype="x-DocumentState"><source><g id="1" ctype="x-text">  Many
+   spaces </g><bpt id="7"/></source></trans-unit>
+      <trans-unit id="n1"><note>no source</note></trans-unit>
+    </body>
+  </file>
+</xliff>
+'''
+
+
+def _write_sample(tmp_path):
+    path = tmp_path / 'sample.xlf'
+    path.write_text(SAMPLE_XLF, encoding='utf-8')
+    return str(path)
+
+
+def test_parse_all_units(tmp_path):
+    parser = XLFParser(_write_sample(tmp_path))
+    units = parser.parse_all_units()
+
+    assert [u.id for u in units] == ['p1', 'p2', 's1', 's2']
+    assert units[0].translatable_text == 'Scene 1'
+    assert units[1].translatable_text == ' Next '
+    assert units[2].segments == ('Hello ', 'world')
+    assert units[2].translatable_text == 'Hello  __SEG__ world'
+    assert units[3].translatable_text == 'Many spaces'
+    assert parser.parse_all_units() is units
+
+
+def test_iter_units_matches_parse_all_units(tmp_path):
+    path = _write_sample(tmp_path)
+
+    streamed = [(u.id, u.datatype, u.translatable_text) for u in XLFParser(path).iter_units()]
+    parsed = [(u.id, u.datatype, u.translatable_text) for u in XLFParser(path).parse_all_units()]
+
+    assert streamed == parsed
+
+
+def test_language_header(tmp_path):
+    parser = XLFParser(_write_sample(tmp_path))
+
+    assert parser.get_source_language() == 'en'
+    assert parser.get_target_language() == 'de'
+
+
+def test_statistics_match_parsed_units(tmp_path):
+    path = _write_sample(tmp_path)
+
+    streamed = XLFParser(path).get_statistics()
+
+    parser = XLFParser(path)
+    parser.parse_all_units()
+    from_units = parser.get_statistics()
+
+    assert streamed == from_units
+    assert streamed['total_units'] == 4
+    assert streamed['plaintext_units'] == 2
+    assert streamed['styled_units'] == 2
+
+
+def test_find_unpaired_tags(tmp_path):
+    parser = XLFParser(_write_sample(tmp_path))
+
+    assert parser.find_unpaired_tags() == [('s2', "Missing <ept> for: {'7'}")]
+
+
+def test_tag_pairing_matches_rid(tmp_path):
+    path = tmp_path / 'rid.xlf'
+    path.write_text(SAMPLE_XLF.replace(
+        '<trans-unit id="n1">',
+        '<trans-unit id="r1" datatype="x-DocumentState"><source><bpt id="4" rid="1"/>'
+        '<g id="5" ctype="x-text">Bold</g><ept id="6" rid="1"/><bpt rid="2"/><ept rid="2"/>'
+        '</source></trans-unit>\n      <trans-unit id="n1">'
+    ), encoding='utf-8')
+
+    assert XLFParser(str(path)).find_unpaired_tags() == [('s2', "Missing <ept> for: {'7'}")]
+
+
+def test_preview_pass_answers_tag_check(tmp_path):
+    parser = XLFParser(_write_sample(tmp_path))
+    list(parser.iter_units_preview())
+
+    assert parser.find_unpaired_tags() == [('s2', "Missing <ept> for: {'7'}")]
+    assert parser._tree is None
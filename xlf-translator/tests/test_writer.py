@@ -0,0 +1,47 @@
+"""
+Tests for XLFWriter
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lxml import etree
+
+from src.parser import XLFParser
+from src.writer import XLFWriter
+
+
+SAMPLE_XLF = '''<?xml version="1.0" encoding="utf-8"?>
+<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
+  <file source-language="en" target-language="de" datatype="plaintext">
+    <body>
+      <trans-unit id="s1" datatype="x-DocumentState"><source><g id="1" ctype="x-text">Hello </g><bpt id="2"/><g id="3" ctype="x-text">world</g><ept id="2"/></source><target><g id="1" ctype="x-text">Hallo __SEG__ </g><bpt id="2"/><g id="3" ctype="x-text">Welt</g><ept id="2"/></target><alt-trans><target><g id="1" ctype="x-text">Servus __SEG__ Welt</g></target></alt-trans></trans-unit>
+    </body>
+  </file>
+</xliff>
+'''
+
+
+def _writer(tmp_path):
+    path = tmp_path / 'sample.xlf'
+    path.write_text(SAMPLE_XLF, encoding='utf-8')
+    parser = XLFParser(str(path))
+    parser.parse_all_units()
+    return XLFWriter(parser)
+
+
+def _g_texts(elem):
+    return [g.text for g in elem.iter('{urn:oasis:names:tc:xliff:document:1.2}g')]
+
+
+def test_cleanup_skips_alt_trans_targets(tmp_path):
+    writer = _writer(tmp_path)
+    output = str(tmp_path / 'out.xlf')
+
+    writer.save(output)
+
+    ns = {'x': 'urn:oasis:names:tc:xliff:document:1.2'}
+    root = etree.parse(output).getroot()
+    assert _g_texts(root.find('.//x:trans-unit/x:target', ns)) == ['Hallo', 'Welt']
+    assert _g_texts(root.find('.//x:alt-trans/x:target', ns)) == ['Servus __SEG__ Welt']